@@ -15,63 +15,183 @@ import os
 import re
 import argparse
 import difflib
-from collections import defaultdict
+from array import array
+from collections import Counter, defaultdict
 
-def analisar_formatacao(arquivo_original, arquivo_formatado):
+# Padrões de expressões regulares pré-compilados (reutilizados em todos os laços por linha)
+# Definição de campo: número seguido de '-' ou '.', nome e tipo do campo
+_PADRAO_CAMPO = re.compile(r'^([0-9]+[\-\.].+?)\s+(Varchar2?\(\d+\)|Date|Number\(\d+\)|Número|Varchar2?|Tabela)')
+# Cabeçalho de seção: apenas letras maiúsculas, espaços, traços e números
+_PADRAO_SECAO = re.compile(r'^[A-ZÇÀÁÂÃÉÊÍÓÔÕÚÜ\s\-0-9]+$')
+# Início de campo no dicionário formatado (sem exigir o tipo)
+_PADRAO_INICIO_CAMPO = re.compile(r'^([0-9]+[\-\.][^:]+?)(?:\s+|$)')
+# Nome do campo DBF dentro da descrição
+_PADRAO_DBF = re.compile(r'DBF:?\s*([A-Z_]+)', re.IGNORECASE)
+# Categorias no formato "1-Nome" ou "1 - Nome"
+_PADRAO_CATEGORIA = re.compile(r'(\d+)\s*[\-:]\s*([^\n\d]+)')
+# Teste rápido de presença de dígitos (pré-filtro para as categorias)
+_TEM_DIGITO = re.compile(r'\d').search
+# Estruturas de mapeamento no código Python: "CAMPO": {'1': "Valor1", '2': "Valor2"}
+_PADRAO_MAPEAMENTO = re.compile(r'"([A-Z_]+)":\s*\{([^}]+)\}')
+# Pares código-valor dentro de um mapeamento
+_PADRAO_PARES = re.compile(r"'(\d+)':\s*\"([^\"]+)\"")
+
+# Classes de linha (bits) usadas na análise do documento formatado
+_LINHA_VAZIA = 0x1
+_LINHA_CAMPO = 0x2
+_LINHA_SECAO = 0x4
+_LINHA_INDENTADA = 0x8
+
+# Rótulos exibidos no resumo da estrutura (0 = linha sem classe específica)
+_ROTULOS_LINHA = {
+    _LINHA_VAZIA: "Linha vazia",
+    _LINHA_CAMPO: "Definição de campo",
+    _LINHA_SECAO: "Cabeçalho/Seção",
+    _LINHA_INDENTADA: "Descrição formatada",
+    0: "Outras linhas",
+}
+
+# Termos de metadados cuja presença é comparada entre o original e o formatado
+_TERMOS_METADADOS = (
+    "Campo Obrigatório", "Campo Essencial", "Campo Interno",
+    "Campo Opcional", "Descrição:", "Características DBF:"
+)
+# Termos já codificados em UTF-8, para contagem direta no buffer de bytes lido do arquivo
+_TERMOS_METADADOS_BYTES = tuple(termo.encode('utf-8') for termo in _TERMOS_METADADOS)
+
+# Autômato Aho-Corasick para os termos de metadados, se pyahocorasick estiver disponível
+try:
+    import ahocorasick
+    _AUTOMATO_METADADOS = ahocorasick.Automaton()
+    for _termo in _TERMOS_METADADOS:
+        _AUTOMATO_METADADOS.add_word(_termo, _termo)
+    _AUTOMATO_METADADOS.make_automaton()
+except ImportError:
+    _AUTOMATO_METADADOS = None
+
+# Similaridade de textos em C++ (RapidFuzz), se disponível
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:
+    Indel = None
+
+def _ler_bytes(caminho):
+    """
+    Lê um arquivo inteiro em modo binário, com buffer de 1 MiB.
+    """
+    with open(caminho, 'rb', buffering=1 << 20) as f:
+        return f.read()
+
+def _ler_texto(caminho):
+    """
+    Lê um arquivo UTF-8 inteiro em modo binário e decodifica uma única vez (evita o
+    decodificador incremental e a tradução de quebras de linha do modo texto).
+    """
+    return _ler_bytes(caminho).decode('utf-8')
+
+def _ler_linhas(caminho):
+    """
+    Lê um arquivo UTF-8 e retorna a lista de linhas, sem os terminadores ('\n' ou '\r\n').
+    """
+    return _ler_texto(caminho).splitlines()
+
+def _contar_termos(dados, linhas):
+    """
+    Conta as ocorrências de cada termo de metadados.
+    
+    Args:
+        dados: Conteúdo bruto do arquivo (bytes UTF-8)
+        linhas: Linhas já decodificadas do mesmo arquivo
+    """
+    contagem = Counter()
+    if _AUTOMATO_METADADOS is not None:
+        # Uma única varredura por linha encontra todos os termos
+        for linha in linhas:
+            contagem.update(termo for _, termo in _AUTOMATO_METADADOS.iter(linha))
+    else:
+        # bytes.count faz a busca em C diretamente sobre o buffer, sem decodificação
+        for termo, termo_bytes in zip(_TERMOS_METADADOS, _TERMOS_METADADOS_BYTES):
+            contagem[termo] = dados.count(termo_bytes)
+    return contagem
+
+def analisar_formatacao(arquivo_original, arquivo_formatado, verificar_arquivos=True):
     """
     Analisa a qualidade da formatação comparando os arquivos original e formatado.
     
     Args:
         arquivo_original: Caminho para o arquivo DICIONARIO.txt original
         arquivo_formatado: Caminho para o arquivo formatado
+        verificar_arquivos: Se False, assume que a existência dos arquivos já foi verificada
     """
     # Verificar se os arquivos existem
-    for arquivo in [arquivo_original, arquivo_formatado]:
-        if not os.path.exists(arquivo):
-            print(f"ERRO: Arquivo não encontrado: {arquivo}")
-            return False
+    if verificar_arquivos:
+        for arquivo in [arquivo_original, arquivo_formatado]:
+            if not os.path.exists(arquivo):
+                print(f"ERRO: Arquivo não encontrado: {arquivo}")
+                return False
     
     try:
-        # Ler os conteúdos dos arquivos
-        with open(arquivo_original, 'r', encoding='utf-8') as f:
-            conteudo_original = f.read()
+        # Ler os arquivos em bytes e decodificar em listas de linhas (os bytes são liberados após a contagem de termos)
+        dados_original = _ler_bytes(arquivo_original)
+        dados_formatado = _ler_bytes(arquivo_formatado)
+        linhas_original = dados_original.decode('utf-8').splitlines()
+        linhas_formatado = dados_formatado.decode('utf-8').splitlines()
         
-        with open(arquivo_formatado, 'r', encoding='utf-8') as f:
-            conteudo_formatado = f.read()
-        
-        # Dividir em linhas
-        linhas_original = conteudo_original.split('\n')
-        linhas_formatado = conteudo_formatado.split('\n')
+        # Contar os termos de metadados (etapa 7) enquanto os bytes brutos estão em memória
+        contagem_original = _contar_termos(dados_original, linhas_original)
+        contagem_formatado = _contar_termos(dados_formatado, linhas_formatado)
+        del dados_original, dados_formatado
         
         print(f"Análise de formatação:")
         print(f"  Original: {len(linhas_original)} linhas")
         print(f"  Formatado: {len(linhas_formatado)} linhas")
         
         # 1. Identificar todos os campos definidos no documento original
-        padrao_campo = re.compile(r'^([0-9]+[\-\.].+?)\s+(Varchar2?\(\d+\)|Date|Number\(\d+\)|Número|Varchar2?|Tabela)')
-        
-        campos_original = []
-        for i, linha in enumerate(linhas_original):
-            match = padrao_campo.match(linha.strip())
+        # (apenas os nomes são necessários, então são acumulados diretamente em um conjunto)
+        total_campos_original = 0
+        nomes_original = set()
+        for linha in linhas_original:
+            match = _PADRAO_CAMPO.match(linha.strip())
             if match:
-                nome_campo = match.group(1).strip()
-                campos_original.append((i, nome_campo))
+                nomes_original.add(match.group(1).strip())
+                total_campos_original += 1
+        nomes_original = frozenset(nomes_original)
         
-        print(f"\nCampos identificados no documento original: {len(campos_original)}")
+        print(f"\nCampos identificados no documento original: {total_campos_original}")
         
-        # 2. Identificar todos os campos no documento formatado
-        campos_formatado = []
-        for i, linha in enumerate(linhas_formatado):
-            match = padrao_campo.match(linha.strip())
+        # 2. Classificar cada linha do documento formatado em uma única passagem.
+        # As contagens de estrutura e as verificações de problemas (etapas 5 e 6)
+        # são derivadas desta classificação, sem novas chamadas às expressões regulares.
+        # Cada linha é limpa (strip) uma única vez e o resultado é reaproveitado.
+        n_formatado = len(linhas_formatado)
+        linhas_limpas = [linha.strip() for linha in linhas_formatado]
+        # Um byte por linha (array compacto) em vez de uma lista de objetos int
+        classes = array('B', bytes(n_formatado))
+        campos_formatado = {}  # índice da linha -> nome do campo
+        indices_secoes = []
+        for i, linha_limpa in enumerate(linhas_limpas):
+            if not linha_limpa:
+                classes[i] = _LINHA_VAZIA
+                continue
+            
+            match = _PADRAO_CAMPO.match(linha_limpa)
             if match:
-                nome_campo = match.group(1).strip()
-                campos_formatado.append((i, nome_campo))
+                classes[i] = _LINHA_CAMPO
+                campos_formatado[i] = match.group(1)
+            elif _PADRAO_SECAO.match(linha_limpa):
+                classes[i] = _LINHA_SECAO
+                indices_secoes.append(i)
+            elif linhas_formatado[i].startswith(("    ", "\t")):
+                # A indentação é testada na linha original (após o strip ela nunca existiria)
+                classes[i] = _LINHA_INDENTADA
+        
+        # Contagem por classe de uma só vez (Counter conta em C e preserva a ordem de aparição)
+        estrutura_formatado = Counter(classes)
         
         print(f"Campos identificados no documento formatado: {len(campos_formatado)}")
         
         # 3. Calcular cobertura de campos
-        nomes_original = set(nome for _, nome in campos_original)
-        nomes_formatado = set(nome for _, nome in campos_formatado)
+        nomes_formatado = frozenset(nome.strip() for nome in campos_formatado.values())
         
         campos_em_ambos = nomes_original.intersection(nomes_formatado)
         campos_apenas_original = nomes_original - nomes_formatado
@@ -92,57 +212,39 @@ def analisar_formatacao(arquivo_original, arquivo_formatado):
                     print(f"  ... e mais {len(campos_apenas_original) - 20} campos")
                     break
         
-        # 5. Analisar a estrutura do documento formatado
-        estrutura_formatado = defaultdict(int)
-        for linha in linhas_formatado:
-            linha_limpa = linha.strip()
-            if not linha_limpa:
-                estrutura_formatado["Linha vazia"] += 1
-            elif padrao_campo.match(linha_limpa):
-                estrutura_formatado["Definição de campo"] += 1
-            elif re.match(r'^[A-ZÇÀÁÂÃÉÊÍÓÔÕÚÜ\s\-0-9]+$', linha_limpa):
-                estrutura_formatado["Cabeçalho/Seção"] += 1
-            elif linha_limpa.startswith("    "):
-                estrutura_formatado["Descrição formatada"] += 1
-            else:
-                estrutura_formatado["Outras linhas"] += 1
-        
+        # 5. Estrutura do documento formatado (contada durante a classificação)
         print("\nEstrutura do documento formatado:")
-        for tipo, contagem in estrutura_formatado.items():
-            print(f"  {tipo}: {contagem} linhas")
+        for classe, contagem in estrutura_formatado.items():
+            print(f"  {_ROTULOS_LINHA[classe]}: {contagem} linhas")
         
         # 6. Identificar possíveis problemas de formatação
         problemas = []
         
         # 6.1 Campos que deveriam ter descrição indentada mas não têm
-        for i, linha in enumerate(linhas_formatado):
-            if padrao_campo.match(linha.strip()):
-                # Se esta é uma definição de campo, a próxima linha não-vazia deveria ser indentada
-                j = i + 1
-                while j < len(linhas_formatado) and not linhas_formatado[j].strip():
-                    j += 1
-                
-                if j < len(linhas_formatado) and not linhas_formatado[j].strip().startswith("    "):
-                    # Próxima linha não-vazia não está indentada
-                    match = padrao_campo.match(linha.strip())
-                    if match:
-                        problemas.append((i+1, f"Campo '{match.group(1)}' não tem descrição indentada"))
+        for i, nome_campo in campos_formatado.items():
+            # Se esta é uma definição de campo, a próxima linha não-vazia deveria ser indentada
+            j = i + 1
+            while j < n_formatado and classes[j] & _LINHA_VAZIA:
+                j += 1
+            
+            if j < n_formatado and not classes[j] & _LINHA_INDENTADA:
+                # Próxima linha não-vazia não está indentada
+                problemas.append((i+1, f"Campo '{nome_campo}' não tem descrição indentada"))
         
         # 6.2 Seções sem linha em branco antes ou depois
-        for i, linha in enumerate(linhas_formatado):
-            if i > 0 and i < len(linhas_formatado) - 1:
-                if re.match(r'^[A-ZÇÀÁÂÃÉÊÍÓÔÕÚÜ\s\-0-9]+$', linha.strip()) and linha.strip():
-                    # Esta é uma linha de seção
-                    if linhas_formatado[i-1].strip() or linhas_formatado[i+1].strip():
-                        problemas.append((i+1, f"Seção '{linha.strip()}' não tem linhas vazias antes/depois"))
+        for i in indices_secoes:
+            # Desconsiderar a primeira e a última linha do documento
+            if 0 < i < n_formatado - 1:
+                if not classes[i-1] & _LINHA_VAZIA or not classes[i+1] & _LINHA_VAZIA:
+                    problemas.append((i+1, f"Seção '{linhas_limpas[i]}' não tem linhas vazias antes/depois"))
         
         # 6.3 Texto que parece continuação de campos mas não está anexado
-        for i in range(1, len(linhas_formatado)):
-            if (linhas_formatado[i].strip() and 
-                not padrao_campo.match(linhas_formatado[i].strip()) and
-                not re.match(r'^[A-ZÇÀÁÂÃÉÊÍÓÔÕÚÜ\s\-0-9]+$', linhas_formatado[i].strip()) and
-                not linhas_formatado[i].strip().startswith("    ") and
-                padrao_campo.match(linhas_formatado[i-1].strip())):
+        # Só linhas logo após uma definição de campo podem ser continuações, então
+        # basta examinar a linha seguinte a cada campo (teste mais restritivo primeiro).
+        for i_campo in campos_formatado:
+            i = i_campo + 1
+            # Linha não vazia, que não é campo, seção nem descrição indentada
+            if i < n_formatado and classes[i] == 0:
                 # Esta linha parece ser uma continuação não formatada
                 problemas.append((i+1, f"Possível continuação não formatada: '{linhas_formatado[i][:50]}...'"))
         
@@ -156,16 +258,13 @@ def analisar_formatacao(arquivo_original, arquivo_formatado):
             print("\nNenhum problema óbvio de formatação detectado.")
             
         # 7. Verificar presença de termos importantes em metadados
-        termos_metadados = [
-            "Campo Obrigatório", "Campo Essencial", "Campo Interno", 
-            "Campo Opcional", "Descrição:", "Características DBF:"
-        ]
+        termos_metadados = _TERMOS_METADADOS
         
+        # As contagens de ambos os documentos foram feitas logo após a leitura
         metadados_contagem = defaultdict(int)
         for termo in termos_metadados:
-            # Contar em ambos os documentos
-            metadados_contagem[f"Original: {termo}"] = conteudo_original.count(termo)
-            metadados_contagem[f"Formatado: {termo}"] = conteudo_formatado.count(termo)
+            metadados_contagem[f"Original: {termo}"] = contagem_original[termo]
+            metadados_contagem[f"Formatado: {termo}"] = contagem_formatado[termo]
         
         print("\nPresença de termos importantes de metadados:")
         for termo, contagem in metadados_contagem.items():
@@ -183,36 +282,33 @@ def analisar_formatacao(arquivo_original, arquivo_formatado):
         traceback.print_exc()
         return False
 
-def verificar_consistencia_mapeamento(arquivo_formatado, arquivo_codigo_python=None):
+def verificar_consistencia_mapeamento(arquivo_formatado, arquivo_codigo_python=None, verificar_arquivos=True):
     """
     Verifica se o mapeamento no dicionário é consistente com o utilizado no código Python.
     
     Args:
         arquivo_formatado: Caminho para o dicionário formatado
         arquivo_codigo_python: Caminho para o código Python com os mapeamentos (opcional)
+        verificar_arquivos: Se False, assume que a existência dos arquivos já foi verificada
     """
     try:
         # Ler o dicionário formatado
-        with open(arquivo_formatado, 'r', encoding='utf-8') as f:
-            conteudo_dicionario = f.read()
+        linhas = _ler_linhas(arquivo_formatado)
         
         # Se arquivo de código Python foi fornecido
-        if arquivo_codigo_python and os.path.exists(arquivo_codigo_python):
-            with open(arquivo_codigo_python, 'r', encoding='utf-8') as f:
-                codigo_python = f.read()
+        if arquivo_codigo_python and (not verificar_arquivos or os.path.exists(arquivo_codigo_python)):
+            codigo_python = _ler_texto(arquivo_codigo_python)
             
             # Extrair os mapeamentos do código Python
             mapeamentos_codigo = {}
             # Procurar por estruturas como "CAMPO": {'1': "Valor1", '2': "Valor2"}
-            padrao_mapeamento = re.compile(r'"([A-Z_]+)":\s*\{([^}]+)\}')
-            for match in padrao_mapeamento.finditer(codigo_python):
+            for match in _PADRAO_MAPEAMENTO.finditer(codigo_python):
                 campo = match.group(1)
                 definicoes = match.group(2)
                 
                 # Extrair os pares de código-valor
                 mapeamentos_codigo[campo] = {}
-                padrao_pares = re.compile(r"'(\d+)':\s*\"([^\"]+)\"")
-                for par_match in padrao_pares.finditer(definicoes):
+                for par_match in _PADRAO_PARES.finditer(definicoes):
                     codigo = par_match.group(1)
                     valor = par_match.group(2)
                     mapeamentos_codigo[campo][codigo] = valor
@@ -225,13 +321,12 @@ def verificar_consistencia_mapeamento(arquivo_formatado, arquivo_codigo_python=N
             
             # Primeiro passo: identificar os campos e suas descrições
             campos_dicionario = {}
-            linhas = conteudo_dicionario.split('\n')
             campo_atual = None
             descricao_atual = []
             
             for linha in linhas:
                 # Se é o início de um novo campo
-                match = re.match(r'^([0-9]+[\-\.][^:]+?)(?:\s+|$)', linha.strip())
+                match = _PADRAO_INICIO_CAMPO.match(linha.strip())
                 if match:
                     # Salvar o campo anterior se existir
                     if campo_atual:
@@ -251,15 +346,19 @@ def verificar_consistencia_mapeamento(arquivo_formatado, arquivo_codigo_python=N
             # Segundo passo: tentar extrair mapeamentos dessas descrições
             mapeamentos_dicionario = {}
             for campo, descricao in campos_dicionario.items():
+                # Pré-filtros baratos: sem "DBF" (o padrão ignora maiúsculas/minúsculas)
+                # ou sem nenhum dígito, as expressões regulares não teriam o que encontrar
+                if 'DBF' not in descricao.upper() or not _TEM_DIGITO(descricao):
+                    continue
+                
                 # Tentar identificar o DBF_FIELD que corresponde ao campo do Python
-                match_dbf = re.search(r'DBF:?\s*([A-Z_]+)', descricao, re.IGNORECASE)
+                match_dbf = _PADRAO_DBF.search(descricao)
                 if match_dbf:
                     dbf_field = match_dbf.group(1)
                     
                     # Procurar por padrões de categorias no formato "1-Nome" ou "1 - Nome"
                     mapeamentos = {}
-                    padrao_categoria = re.compile(r'(\d+)\s*[\-:]\s*([^\n\d]+)')
-                    for cat_match in padrao_categoria.finditer(descricao):
+                    for cat_match in _PADRAO_CATEGORIA.finditer(descricao):
                         codigo = cat_match.group(1)
                         valor = cat_match.group(2).strip()
                         mapeamentos[codigo] = valor
@@ -309,8 +408,13 @@ def verificar_consistencia_mapeamento(arquivo_formatado, arquivo_codigo_python=N
 
 def comparar_textos(texto1, texto2):
     """
-    Compara dois textos e retorna uma medida de similaridade
+    Compara dois textos e retorna uma medida de similaridade entre 0 e 1.
+    
+    Usa a similaridade Indel normalizada do RapidFuzz (implementação em C++) quando
+    disponível; caso contrário, recorre ao difflib.SequenceMatcher.
     """
+    if Indel is not None:
+        return Indel.normalized_similarity(texto1, texto2, processor=None)
     return difflib.SequenceMatcher(None, texto1, texto2).ratio()
 
 def sugerir_correcoes(arquivo_formatado):
@@ -318,15 +422,17 @@ def sugerir_correcoes(arquivo_formatado):
     Analisa o arquivo formatado e sugere possíveis correções
     """
     try:
-        with open(arquivo_formatado, 'r', encoding='utf-8') as f:
-            linhas = f.readlines()
+        linhas = _ler_linhas(arquivo_formatado)
         
         sugestoes = []
         
+        # Limpar cada linha uma única vez (cada uma é comparada com a seguinte)
+        linhas_limpas = [linha.strip() for linha in linhas]
+        
         # Verificar linhas consecutivas que parecem ser continuação
-        for i in range(1, len(linhas)):
-            linha_atual = linhas[i].strip()
-            linha_anterior = linhas[i-1].strip()
+        for i in range(1, len(linhas_limpas)):
+            linha_atual = linhas_limpas[i]
+            linha_anterior = linhas_limpas[i-1]
             
             # Se a linha atual não começa com número ou espaços, e a linha anterior
             # termina sem pontuação, pode ser uma continuação
@@ -378,10 +484,10 @@ def main():
     print(f"Arquivo original: {args.original}")
     print(f"Arquivo formatado: {args.formatado}")
     
-    # Analisar formatação
+    # Analisar formatação (a existência dos arquivos é verificada aqui uma única vez)
     if os.path.exists(args.original):
         print("\n--- Análise de Formatação ---")
-        analisar_formatacao(args.original, args.formatado)
+        analisar_formatacao(args.original, args.formatado, verificar_arquivos=False)
     else:
         print(f"\nArquivo original não encontrado: {args.original}")
         print("Pulando análise comparativa.")
@@ -389,7 +495,7 @@ def main():
     # Verificar consistência com código Python
     if args.codigo and os.path.exists(args.codigo):
         print("\n--- Verificação de Consistência com Código Python ---")
-        verificar_consistencia_mapeamento(args.formatado, args.codigo)
+        verificar_consistencia_mapeamento(args.formatado, args.codigo, verificar_arquivos=False)
     
     # Gerar sugestões de correção
     if args.sugestoes:
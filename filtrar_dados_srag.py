@@ -13,71 +13,241 @@ Uso: python filtrar_dados_srag.py [--arquivo ARQUIVO] [--saida ARQUIVO_SAIDA]
 
 import pandas as pd
 import os
+import csv
+import io
+import shutil
 import argparse
 import numpy as np
+from collections import defaultdict
 
-def filtrar_dados_srag(arquivo_entrada, arquivo_saida, backup=True):
+# Colunas categóricas de baixa cardinalidade (já mapeadas para texto pelo processar_srag.py).
+# São lidas com codificação por dicionário (category/dictionary), de modo que as
+# verificações de nulos e a cópia dos registros operam sobre códigos inteiros.
+_COLUNAS_CATEGORICAS = [
+    'EVOLUCAO', 'CS_SEXO', 'CS_RACA', 'CS_GESTANT', 'CS_ESCOL_N', 'CLASSI_FIN',
+    'CRITERIO', 'UTI', 'SUPORT_VEN', 'SG_UF_NOT', 'SG_UF', 'SG_UF_INTE'
+]
+
+def _criar_backup(arquivo, backup_path):
+    """
+    Preserva o arquivo original em `backup_path` sem reprocessá-lo.
+    
+    Usa um hardlink quando possível: como a saída filtrada substitui o original via
+    os.replace, o backup continua apontando para o conteúdo antigo. Se o sistema de
+    arquivos não suportar hardlinks, faz uma cópia byte a byte com shutil.copyfile.
+    """
+    if os.path.lexists(backup_path):
+        os.remove(backup_path)
+    try:
+        os.link(arquivo, backup_path)
+    except OSError:
+        shutil.copyfile(arquivo, backup_path)
+
+def _filtrar_com_pandas(arquivo_entrada, destino, chunksize):
+    """
+    Filtra o arquivo com pandas, lendo e gravando em partes de `chunksize` linhas.
+    
+    Returns:
+        tuple: (total de registros, removidos por TEMPO_UTI, removidos por EVOLUCAO, colunas)
+    """
+    # Carregar os dados em partes, com tipos compactos para TEMPO_UTI e colunas categóricas.
+    # As demais colunas são lidas como texto: com tipos inferidos em cada parte, uma coluna
+    # de inteiros com nulos só em algumas partes seria gravada ora como 5, ora como 5.0
+    tipos = defaultdict(lambda: str, {col: 'category' for col in _COLUNAS_CATEGORICAS})
+    tipos['TEMPO_UTI'] = 'float32'
+    leitor = pd.read_csv(arquivo_entrada, sep=';', encoding='utf-8-sig', chunksize=chunksize,
+                         dtype=tipos)
+    
+    # Opções de escrita: blocos de 100 mil linhas, aspas só quando necessárias e '\n'
+    # como terminador (sem tradução para CRLF no Windows)
+    opcoes_csv = {'sep': ';', 'index': False, 'chunksize': 100_000,
+                  'quoting': csv.QUOTE_MINIMAL, 'lineterminator': '\n'}
+    
+    tamanho_original = 0
+    removidos_tempo_uti = 0
+    removidos_evolucao = 0
+    colunas = []
+    
+    with open(destino, 'w', encoding='utf-8-sig', newline='') as saida:
+        for n_parte, df in enumerate(leitor):
+            cabecalho = n_parte == 0
+            if cabecalho:
+                colunas = list(df.columns)
+            tamanho_original += len(df)
+            
+            # Combinar os dois filtros em uma única máscara, aplicada de uma só vez
+            # (array booleano do NumPy, sem alinhamento de índice nem DataFrames intermediários)
+            mascara = np.ones(len(df), dtype=bool)
+            
+            # Filtro 1: Remover registros com TEMPO_UTI > 160 (nulos são mantidos; NaN != NaN).
+            # df.eval usa o numexpr, quando instalado, para avaliar a expressão vetorizada.
+            if 'TEMPO_UTI' in colunas:
+                mascara &= df.eval('TEMPO_UTI <= 160 or TEMPO_UTI != TEMPO_UTI').to_numpy(dtype=bool)
+                removidos_tempo_uti += len(df) - int(mascara.sum())
+            
+            # Filtro 2: Remover registros com EVOLUCAO nulo (contados entre os restantes)
+            if 'EVOLUCAO' in colunas:
+                restantes = int(mascara.sum())
+                mascara &= df['EVOLUCAO'].notna().to_numpy()
+                removidos_evolucao += restantes - int(mascara.sum())
+            
+            df.loc[mascara].to_csv(saida, header=cabecalho, **opcoes_csv)
+    
+    return tamanho_original, removidos_tempo_uti, removidos_evolucao, colunas
+
+def _filtrar_com_pyarrow(arquivo_entrada, destino):
+    """
+    Filtra o arquivo com o leitor CSV multithread do PyArrow, lote a lote.
+    
+    Todas as colunas são lidas como texto, de modo que os registros mantidos são gravados
+    com os mesmos valores da entrada; apenas TEMPO_UTI é convertida para número no filtro.
+    
+    O CSV gravado usa aspas apenas quando necessário, como no caminho do pandas: o
+    escritor do PyArrow grava os lotes sem aspas e, nos lotes com algum valor que contém
+    o separador, aspas ou quebras de linha (que ele recusa sem aspas), o lote é gravado
+    pelo pandas com csv.QUOTE_MINIMAL.
+    
+    Returns:
+        tuple: (total de registros, removidos por TEMPO_UTI, removidos por EVOLUCAO, colunas)
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.compute as pc
+    
+    # Ler apenas o cabeçalho para declarar todas as colunas como texto
+    # (as categóricas como texto codificado por dicionário)
+    with open(arquivo_entrada, 'r', encoding='utf-8-sig', newline='') as f:
+        colunas = next(csv.reader(f, delimiter=';'), [])
+    
+    tipo_dicionario = pa.dictionary(pa.int32(), pa.string())
+    tipos = {col: tipo_dicionario if col in _COLUNAS_CATEGORICAS else pa.string() for col in colunas}
+    
+    leitor = pv.open_csv(
+        arquivo_entrada,
+        parse_options=pv.ParseOptions(delimiter=';', newlines_in_values=True),
+        convert_options=pv.ConvertOptions(
+            column_types=tipos,
+            strings_can_be_null=True
+        )
+    )
+    # O escritor do PyArrow só põe aspas em todos os textos ('needed', inclusive no
+    # cabeçalho) ou em nenhum ('none'); o cabeçalho é gravado pelo módulo csv
+    opcoes_escrita = pv.WriteOptions(delimiter=';', include_header=False, quoting_style='none')
+    opcoes_csv = {'sep': ';', 'index': False, 'header': False,
+                  'quoting': csv.QUOTE_MINIMAL, 'lineterminator': '\n'}
+    
+    tamanho_original = 0
+    removidos_tempo_uti = 0
+    removidos_evolucao = 0
+    
+    with open(destino, 'wb') as saida:
+        # BOM UTF-8, como nos arquivos gravados pelo pandas com encoding='utf-8-sig'
+        saida.write('\ufeff'.encode('utf-8'))
+        cabecalho = io.StringIO()
+        csv.writer(cabecalho, delimiter=';', lineterminator='\n').writerow(leitor.schema.names)
+        saida.write(cabecalho.getvalue().encode('utf-8'))
+        
+        for lote in leitor:
+            tamanho_original += lote.num_rows
+            
+            mascara = pa.array(np.ones(lote.num_rows, dtype=bool))
+            
+            # Filtro 1: Remover registros com TEMPO_UTI > 160 (nulos são mantidos)
+            if 'TEMPO_UTI' in colunas:
+                tempo_uti = pc.cast(lote.column('TEMPO_UTI'), pa.float64())
+                mascara = pc.invert(pc.fill_null(pc.greater(tempo_uti, 160), False))
+                removidos_tempo_uti += lote.num_rows - (pc.sum(mascara).as_py() or 0)
+            
+            # Filtro 2: Remover registros com EVOLUCAO nulo (contados entre os restantes)
+            if 'EVOLUCAO' in colunas:
+                restantes = pc.sum(mascara).as_py() or 0
+                mascara = pc.and_(mascara, pc.is_valid(lote.column('EVOLUCAO')))
+                removidos_evolucao += restantes - (pc.sum(mascara).as_py() or 0)
+            
+            filtrado = lote.filter(mascara)
+            buffer = pa.BufferOutputStream()
+            try:
+                pv.write_csv(filtrado, buffer, write_options=opcoes_escrita)
+                saida.write(buffer.getvalue().to_pybytes())
+            except pa.ArrowInvalid:
+                saida.write(filtrado.to_pandas().to_csv(**opcoes_csv).encode('utf-8'))
+
+    return tamanho_original, removidos_tempo_uti, removidos_evolucao, colunas
+
+def filtrar_dados_srag(arquivo_entrada, arquivo_saida, backup=True, chunksize=200_000):
     """
     Filtra o arquivo de dados SRAG processados para remover registros problemáticos.
     
+    O arquivo é lido e gravado em partes, de modo que o uso de memória fica limitado
+    a uma parte por vez, independentemente do tamanho do arquivo. Se o PyArrow estiver
+    disponível, a leitura e a filtragem usam seus kernels multithread.
+    
     Args:
         arquivo_entrada: Caminho para o arquivo de dados SRAG processados
         arquivo_saida: Caminho para o arquivo de saída com dados filtrados
         backup: Se True, cria uma cópia de backup do arquivo original
+        chunksize: Número de linhas lidas e filtradas por vez (leitura via pandas)
     
     Returns:
         bool: True se o processo foi concluído com sucesso
     """
+    sobrescrever = False
     try:
         print(f"Carregando dados de {arquivo_entrada}...")
-        # Carregar os dados
-        df = pd.read_csv(arquivo_entrada, sep=';', encoding='utf-8-sig')
         
-        tamanho_original = len(df)
-        print(f"Total de registros carregados: {tamanho_original}")
+        # Ao sobrescrever o arquivo original, gravar em um arquivo temporário e substituir no final
+        sobrescrever = os.path.abspath(arquivo_entrada) == os.path.abspath(arquivo_saida)
+        destino = f"{arquivo_saida}.tmp" if sobrescrever else arquivo_saida
         
         # Criar backup se solicitado
-        if backup and arquivo_entrada == arquivo_saida:
+        if backup and sobrescrever:
             backup_path = f"{arquivo_entrada}.bak"
             print(f"Criando backup do arquivo original em {backup_path}")
-            df.to_csv(backup_path, sep=';', encoding='utf-8-sig', index=False)
+            _criar_backup(arquivo_entrada, backup_path)
+        
+        # Verificar se pyarrow está disponível para melhor desempenho
+        try:
+            import pyarrow  # noqa: F401
+            print("Usando pyarrow para leitura e filtragem multithread")
+            resultado = _filtrar_com_pyarrow(arquivo_entrada, destino)
+        except ImportError:
+            print("PyArrow não disponível. Para melhor desempenho, instale: pip install pyarrow")
+            print(f"Lendo o arquivo em partes de {chunksize} linhas")
+            resultado = _filtrar_com_pandas(arquivo_entrada, destino, chunksize)
+        
+        tamanho_original, removidos_tempo_uti, removidos_evolucao, colunas = resultado
         
-        # Filtro 1: Remover registros com TEMPO_UTI > 160
-        if 'TEMPO_UTI' in df.columns:
-            registros_antes = len(df)
-            df = df[~(df['TEMPO_UTI'] > 160)]
-            registros_removidos = registros_antes - len(df)
-            print(f"Removidos {registros_removidos} registros com TEMPO_UTI > 160")
+        if sobrescrever:
+            os.replace(destino, arquivo_saida)
+        
+        print(f"Total de registros carregados: {tamanho_original}")
+        if 'TEMPO_UTI' in colunas:
+            print(f"Removidos {removidos_tempo_uti} registros com TEMPO_UTI > 160")
         else:
             print("AVISO: Coluna 'TEMPO_UTI' não encontrada no arquivo")
-        
-        # Filtro 2: Remover registros com EVOLUCAO nulo
-        if 'EVOLUCAO' in df.columns:
-            registros_antes = len(df)
-            df = df[~df['EVOLUCAO'].isna()]
-            registros_removidos = registros_antes - len(df)
-            print(f"Removidos {registros_removidos} registros com EVOLUCAO nulo")
+        if 'EVOLUCAO' in colunas:
+            print(f"Removidos {removidos_evolucao} registros com EVOLUCAO nulo")
         else:
             print("AVISO: Coluna 'EVOLUCAO' não encontrada no arquivo")
         
         # Calcular total de registros removidos
-        registros_filtrados = len(df)
-        total_removidos = tamanho_original - registros_filtrados
+        total_removidos = removidos_tempo_uti + removidos_evolucao
+        registros_filtrados = tamanho_original - total_removidos
         percentual_removido = (total_removidos / tamanho_original) * 100 if tamanho_original > 0 else 0
         
         print(f"\nResumo da filtragem:")
         print(f"  - Total de registros originais: {tamanho_original}")
         print(f"  - Total de registros após filtragem: {registros_filtrados}")
         print(f"  - Registros removidos: {total_removidos} ({percentual_removido:.2f}%)")
-        
-        # Salvar os dados filtrados
-        print(f"Salvando dados filtrados em {arquivo_saida}...")
-        df.to_csv(arquivo_saida, sep=';', encoding='utf-8-sig', index=False)
+        print(f"Dados filtrados salvos em {arquivo_saida}")
         
         print("Filtro concluído com sucesso!")
         return True
     except Exception as e:
         print(f"ERRO durante a filtragem: {str(e)}")
+        # Remover o arquivo temporário incompleto (o original permanece intacto)
+        if sobrescrever and os.path.exists(destino):
+            os.remove(destino)
         import traceback
         traceback.print_exc()
         return False
@@ -15,230 +15,381 @@ Este script:
 
 import os
 import re
+import sys
 import argparse
 from enum import Enum
+from functools import lru_cache
+from multiprocessing import Pool
+
+# Padrões de expressões regulares pré-compilados (compilados uma única vez por execução)
+# Cabeçalho de seção: apenas letras maiúsculas, espaços, traços e números
+# (sem âncoras: é aplicado com fullmatch à linha inteira)
+_PADRAO_SECAO = re.compile(r'[A-ZÇÀÁÂÃÉÊÍÓÔÕÚÜ\s\-0-9]+')
+# Definição de campo: número seguido de '-' ou '.', nome e tipo do campo.
+# A alternância já inclui 'Número' e 'Tabela', então um único match cobre os três
+# casos (campos comuns, numéricos e tabelas de referência); o grupo 2 indica o tipo.
+_PADRAO_CAMPO = re.compile(r'^([0-9]+[\-\.].*?)\s+(Varchar2?\(\d+\)|Date|Number\(\d+\)|Número|Varchar2?|Tabela)')
+# Padrão para colunas de tabelas
+_PADRAO_TABELA = re.compile(r'^[A-Z][a-zçàáâãéêíóôõúü]+\s*\(.*?\)$')
+# Início de uma definição de campo (sem exigir o tipo)
+_PADRAO_INICIO_CAMPO = re.compile(r'^[0-9]+[\-\.]')
+# Prefixos de metadados que separam as partes da descrição de um campo. O prefixo comum
+# "Campo " é fatorado, de modo que as quatro variantes são testadas com uma única comparação
+# literal; o grupo 1 continua retornando o termo completo (ex.: "Campo Obrigatório").
+_PADRAO_METADADOS = re.compile(r'(Descrição:|Características DBF:|Campo (?:Obrigatório|Essencial|Interno|Opcional))')
+
+# Padrões usados na análise da estrutura (exigem ao menos um caractere no nome do campo)
+_PADRAO_ANALISE_PRINCIPAL = re.compile(r'^([0-9]+[\-\.].+?)\s+(Varchar2?\(\d+\)|Date|Number\(\d+\))')
+_PADRAO_ANALISE_NUMERICO = re.compile(r'^([0-9]+[\-\.].+?)\s+(Número)')
+_PADRAO_ANALISE_TABELA = re.compile(r'^([0-9]+[\-\.].+?)\s+(Tabela)')
+# Padrões da análise na ordem em que os tipos são exibidos no relatório
+_PADROES_ANALISE = (
+    ("Padrão", _PADRAO_ANALISE_PRINCIPAL),
+    ("Número", _PADRAO_ANALISE_NUMERICO),
+    ("Tabela", _PADRAO_ANALISE_TABELA),
+)
+_TIPOS_ANALISE = tuple(tipo for tipo, _ in _PADROES_ANALISE)
+# Possível campo, com ou sem tipo reconhecido
+_PADRAO_CAMPO_POTENCIAL = re.compile(r'^([0-9]+[\-\.].+)')
+# Trecho que parece ser um tipo de campo no meio da linha
+_PADRAO_TIPO = re.compile(r'\s+(Varchar2?\(\d+\)|Date|Number\(\d+\)|Número|Varchar2?|Tabela|[A-Z][a-z]+)\s+')
+
+# Caracteres que podem iniciar um cabeçalho de seção (a linha já chega sem espaços nas pontas)
+_INICIO_SECAO = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZÇÀÁÂÃÉÊÍÓÔÕÚÜ-0123456789')
+
+# Classes de linha (bits) retornadas por _classificar_linha
+_LINHA_OUTRA = 0x0
+_LINHA_VAZIA = 0x1
+_LINHA_SECAO = 0x2
+_LINHA_CAMPO = 0x4
+# Linha começa como um campo (número seguido de '-' ou '.'), com ou sem tipo reconhecido
+_LINHA_INICIO_CAMPO = 0x8
+# Classes que encerram a descrição do campo em andamento
+_FIM_DESCRICAO = _LINHA_CAMPO | _LINHA_SECAO
+
+def _eh_secao(linha_limpa):
+    """Verifica se a linha (sem espaços nas pontas) é um cabeçalho de seção."""
+    return linha_limpa[:1] in _INICIO_SECAO and _PADRAO_SECAO.fullmatch(linha_limpa) is not None
+
+@lru_cache(maxsize=16384)
+def _classificar_linha(linha_limpa):
+    """
+    Classifica uma linha já sem espaços nas pontas, retornando uma combinação de bits
+    _LINHA_* (vazia, seção, campo ou outra, mais _LINHA_INICIO_CAMPO).
+    
+    Os padrões de campo só são aplicados se a linha começa com dígito: a maioria das
+    linhas (continuações de descrição) é descartada pelo primeiro caractere. O resultado
+    fica em cache, então cada linha distinta passa pelas expressões regulares uma única
+    vez, seja lida à frente de um campo ou no laço principal.
+    Um campo nunca é também um cabeçalho: todos os tipos de campo têm minúsculas.
+    """
+    if not linha_limpa:
+        return _LINHA_VAZIA
+    classe = _LINHA_OUTRA
+    if linha_limpa[0].isdigit() and _PADRAO_INICIO_CAMPO.match(linha_limpa):
+        if _PADRAO_CAMPO.match(linha_limpa):
+            return _LINHA_INICIO_CAMPO | _LINHA_CAMPO
+        classe = _LINHA_INICIO_CAMPO
+    if _eh_secao(linha_limpa):
+        classe |= _LINHA_SECAO
+    return classe
+
+def _partes_descricao(descricao):
+    """
+    Percorre a descrição de um campo, separada pelos prefixos de metadados.
+    
+    Gera pares (prefixo, texto): o primeiro par tem prefixo vazio (texto antes do primeiro
+    metadado) e cada par seguinte traz o prefixo encontrado e o texto até o próximo.
+    """
+    inicio = 0
+    prefixo = ""
+    for match in _PADRAO_METADADOS.finditer(descricao):
+        yield prefixo, descricao[inicio:match.start()].strip()
+        prefixo = sys.intern(match.group(1))  # Um dos seis prefixos fixos
+        inicio = match.end()
+    yield prefixo, descricao[inicio:].strip()
+
+def _ler_conteudo(caminho):
+    """
+    Lê o arquivo de dicionário inteiro, com buffer de 1 MiB.
+    
+    O modo texto é mantido de propósito: read() decodifica o arquivo de uma só vez e
+    normaliza '\r\n' e '\r' para '\n', de modo que split('\n') separa as linhas
+    exatamente como antes (splitlines() também quebraria em \f, \x1c, U+2028 etc.).
+    """
+    with open(caminho, 'r', encoding='utf-8', buffering=1 << 20) as f:
+        return f.read()
 
 class FormatoSaida(Enum):
     TEXTO = "texto"
     MARKDOWN = "markdown"
     ESTRUTURADO = "estruturado"
 
-def formatar_dicionario(arquivo_entrada, arquivo_saida, formato=FormatoSaida.ESTRUTURADO):
+def _separar_linhas(arquivo):
+    """
+    Gera as linhas de um arquivo aberto em modo texto, uma de cada vez, exatamente como
+    conteudo.split('\n') as separaria (sem o terminador e com uma última linha vazia se
+    o arquivo for vazio ou terminar em quebra de linha).
+    """
+    completa = True
+    for linha in arquivo:
+        completa = linha.endswith('\n')
+        yield linha[:-1] if completa else linha
+    if completa:
+        yield ''
+
+class _LeitorLinhas:
+    """
+    Lê um arquivo de dicionário linha a linha, mantendo apenas a linha atual e a
+    seguinte em memória (a seguinte é necessária para decidir onde termina um campo).
+    """
+    def __init__(self, arquivo):
+        self._linhas = _separar_linhas(arquivo)
+        self._seguinte = self._ler()
+        self.total = 0
+    
+    def _ler(self):
+        linha = next(self._linhas, None)
+        return None if linha is None else (linha, linha.strip())
+    
+    def proxima(self):
+        """
+        Retorna (linha, linha sem espaços nas pontas, próxima linha sem espaços nas pontas),
+        com None no último campo se esta for a última linha, ou None no fim do arquivo.
+        """
+        atual = self._seguinte
+        if atual is None:
+            return None
+        self._seguinte = self._ler()
+        self.total += 1
+        return atual[0], atual[1], None if self._seguinte is None else self._seguinte[1]
+
+def _formatar_campo_estruturado(leitor, linha_atual, nome_campo, tipo_campo, resto_linha):
+    """
+    Monta um campo no formato estruturado, lendo suas linhas de descrição do leitor.
+    
+    Returns:
+        tuple: (campo formatado, item do leitor que encerrou o campo ou None no fim do arquivo)
+    """
+    # As partes são acumuladas em listas e unidas no final (tempo linear,
+    # em vez de recopiar a string a cada concatenação)
+    campo_formatado = [nome_campo, f"    Tipo: {tipo_campo}"]
+    
+    # Continuar lendo as próximas linhas até encontrar outro campo ou seção
+    partes_descricao = [resto_linha]
+    item = leitor.proxima()
+    
+    # Modificação: verificamos linhas até encontrar próximo campo, seção, ou linha vazia seguida de algo que parece um campo
+    while item is not None:
+        _, linha_j, prox_linha = item
+        classe_j = _classificar_linha(linha_j)
+        
+        # Se encontrarmos padrão de início de campo ou de seção, paramos
+        if classe_j & _FIM_DESCRICAO:
+            break
+            
+        # Se for linha vazia seguida de algo que parece um campo, paramos
+        # (a classe da próxima linha fica em cache para a iteração seguinte)
+        if classe_j == _LINHA_VAZIA and prox_linha is not None:
+            if _classificar_linha(prox_linha) & _LINHA_INICIO_CAMPO:
+                break
+        
+        # Se chegou aqui, a linha atual é parte da descrição do campo
+        if linha_j:  # Se não for linha vazia
+            partes_descricao.append(linha_j)
+        
+        item = leitor.proxima()
+    
+    # Adicionar a descrição formatada
+    descricao_campo = " ".join(partes_descricao)
+    if descricao_campo:
+        # MELHORIA: Identificar partes da descrição com mais precisão
+        # Incluir mais padrões de metadados
+        # Formatar cada parte adequadamente
+        for prefixo, texto in _partes_descricao(descricao_campo):
+            if prefixo:
+                campo_formatado.append(f"    {prefixo} {texto}")
+            elif texto:
+                campo_formatado.append(f"    {texto}")
+    
+    return "\n".join(campo_formatado), item
+
+def _formatar_campo_markdown(leitor, linha_atual, nome_campo, tipo_campo, resto_linha):
+    """
+    Monta um campo em Markdown, lendo suas linhas de descrição do leitor.
+    
+    Returns:
+        tuple: (campo formatado, item do leitor que encerrou o campo ou None no fim do arquivo)
+    """
+    # Formato Markdown com cabeçalho H3 para o nome do campo
+    campo_formatado = [f"### {nome_campo}", f"**Tipo:** {tipo_campo}"]
+    
+    # Processar descrição da mesma forma que no formato estruturado
+    partes_descricao = [resto_linha]
+    item = leitor.proxima()
+    
+    while item is not None and not _classificar_linha(item[1]) & _FIM_DESCRICAO:
+        if item[1]:
+            partes_descricao.append(item[1])
+        item = leitor.proxima()
+    
+    descricao_campo = " ".join(partes_descricao)
+    if descricao_campo:
+        # Formato mais simples para Markdown
+        for prefixo, texto in _partes_descricao(descricao_campo):
+            if prefixo:
+                campo_formatado.append(f"**{prefixo.strip()}** {texto}")
+            elif texto:
+                campo_formatado.append(texto)
+    
+    return "\n\n".join(campo_formatado), item
+
+def _formatar_campo_texto(leitor, linha_atual, nome_campo, tipo_campo, resto_linha):
+    """
+    Monta um campo no formato de texto simples (a linha do campo e suas continuações
+    unidas em uma única linha).
+    
+    Returns:
+        tuple: (campo formatado, item do leitor que encerrou o campo ou None no fim do arquivo)
+    """
+    # Juntar todas as linhas relacionadas ao campo
+    partes_texto = [linha_atual]
+    item = leitor.proxima()
+    
+    while item is not None and not _classificar_linha(item[1]) & _FIM_DESCRICAO:
+        if item[1]:
+            partes_texto.append(item[1])
+        item = leitor.proxima()
+    
+    return " ".join(partes_texto), item
+
+# Função de formatação de campo para cada formato de saída
+_FORMATADORES_CAMPO = {
+    FormatoSaida.ESTRUTURADO: _formatar_campo_estruturado,
+    FormatoSaida.MARKDOWN: _formatar_campo_markdown,
+    FormatoSaida.TEXTO: _formatar_campo_texto,
+}
+
+def _gerar_saida(leitor, formato, estatisticas):
+    """
+    Processa as linhas do leitor e gera as entradas do arquivo formatado (uma entrada
+    pode ocupar várias linhas). Os contadores de diagnóstico são acumulados em `estatisticas`.
+    """
+    # O formato é resolvido uma única vez, fora do laço
+    formatar_campo = _FORMATADORES_CAMPO[formato]
+    ultima_saida = None
+    item = leitor.proxima()
+    
+    while item is not None:
+        linha, linha_limpa, _ = item
+        classe = _classificar_linha(linha_limpa)
+        
+        # Caso 1: Linha vazia - preservar como separador
+        if classe == _LINHA_VAZIA:
+            ultima_saida = ''
+            yield ultima_saida
+            item = leitor.proxima()
+            continue
+        
+        # Linha sem os espaços finais; sem indentação, coincide com a linha já limpa
+        # (strip e rstrip removem os mesmos caracteres)
+        linha_atual = linha.rstrip() if linha[0].isspace() else linha_limpa
+        
+        # Caso 2: Linha é um cabeçalho de seção
+        if classe & _LINHA_SECAO:
+            # Adicionar uma linha em branco antes do cabeçalho se não for a primeira linha
+            if ultima_saida:
+                yield ''
+                
+            yield linha_atual
+            estatisticas['secoes'] += 1
+            
+            # Adicionar uma linha em branco após o cabeçalho
+            ultima_saida = ''
+            yield ultima_saida
+            item = leitor.proxima()
+            continue
+        
+        # Caso 3: Início de definição de campo (um único padrão para todos os tipos).
+        # O padrão é aplicado à linha com a indentação original: uma linha indentada
+        # não inicia um campo no laço principal.
+        match = _PADRAO_CAMPO.match(linha_atual) if classe & _LINHA_CAMPO else None
+        if match:
+            nome_campo = match.group(1).strip()
+            # Os tipos formam um vocabulário pequeno: internar faz todos os campos do mesmo
+            # tipo compartilharem um único objeto string
+            tipo_campo = sys.intern(match.group(2).strip())
+            resto_linha = linha_atual[match.end():].strip()
+            
+            # A próxima definição começa na linha que encerrou o campo
+            ultima_saida, item = formatar_campo(leitor, linha_atual, nome_campo, tipo_campo, resto_linha)
+            yield ultima_saida
+            estatisticas['campos'] += 1
+        
+        else:
+            # Caso 4: Outras linhas - preservar como estão
+            ultima_saida = linha_atual
+            yield ultima_saida
+            estatisticas['nao_processadas'] += 1
+            item = leitor.proxima()
+
+def formatar_dicionario(arquivo_entrada, arquivo_saida, formato=FormatoSaida.ESTRUTURADO, verificar_arquivo=True):
     """
     Formata o arquivo de dicionário para corrigir quebras de linha indevidas.
     
+    O arquivo é lido e gravado em fluxo: apenas a linha atual, a seguinte e o campo em
+    formação ficam em memória, independentemente do tamanho do dicionário.
+    
     Args:
         arquivo_entrada: Caminho para o arquivo DICIONARIO.txt original
         arquivo_saida: Caminho para o arquivo formatado de saída
         formato: Tipo de formatação a ser aplicada na saída
+        verificar_arquivo: Se False, assume que a existência do arquivo já foi verificada
     """
     print(f"Iniciando formatação do arquivo: {arquivo_entrada}")
     print(f"Formato de saída: {formato.value}")
     
     # Verificar se o arquivo existe
-    if not os.path.exists(arquivo_entrada):
+    if verificar_arquivo and not os.path.exists(arquivo_entrada):
         print(f"ERRO: Arquivo não encontrado: {arquivo_entrada}")
         return False
     
     try:
-        # Ler o conteúdo completo do arquivo
-        with open(arquivo_entrada, 'r', encoding='utf-8') as f:
-            conteudo = f.read()
-        
-        print(f"Arquivo lido com sucesso. Tamanho: {len(conteudo)} bytes.")
-        
-        # Dividir o conteúdo em linhas para processamento
-        linhas = conteudo.split('\n')
-        
-        # 1. Pré-processamento: Identificar cabeçalhos, seções e padrões importantes
-        # Possíveis cabeçalhos de seção (letras maiúsculas, possivelmente com traços e números)
-        padrao_secao = re.compile(r'^[A-ZÇÀÁÂÃÉÊÍÓÔÕÚÜ\s\-0-9]+$')
-        
-        # Padrão MELHORADO para identificar o início de uma definição de campo
-        # Cobre mais variações de tipos e formatos
-        padrao_campo = re.compile(r'^([0-9]+[\-\.].*?)\s+(Varchar2?\(\d+\)|Date|Number\(\d+\)|Número|Varchar2?|Tabela)')
+        tamanho = os.path.getsize(arquivo_entrada)
+        print(f"Arquivo aberto com sucesso. Tamanho: {tamanho} bytes.")
         
-        # Padrão adicional para campos numéricos específicos
-        padrao_campo_numerico = re.compile(r'^([0-9]+[\-\.].*?)\s+(Número)')
+        # Arquivo vazio: não há o que processar, a saída também fica vazia
+        if tamanho == 0:
+            open(arquivo_saida, 'w', encoding='utf-8').close()
+            print(f"AVISO: Arquivo vazio. Arquivo de saída vazio criado em: {arquivo_saida}")
+            return True
         
-        # Padrão adicional para tabelas de referência 
-        padrao_campo_tabela = re.compile(r'^([0-9]+[\-\.].*?)\s+(Tabela)')
-        
-        # Padrão para colunas de tabelas
-        padrao_tabela = re.compile(r'^[A-Z][a-zçàáâãéêíóôõúü]+\s*\(.*?\)$')
+        # 1. Pré-processamento: os padrões de cabeçalhos, seções e campos são
+        # pré-compilados no nível do módulo (_PADRAO_SECAO, _PADRAO_CAMPO, ...)
         
         # Contadores para diagnóstico
-        campos_formatados = 0
-        secoes_formatadas = 0
-        linhas_nao_processadas = 0
-        
-        # 2. Processamento principal: Juntar linhas que pertencem ao mesmo campo
-        linhas_processadas = []
-        i = 0
+        estatisticas = {'campos': 0, 'secoes': 0, 'nao_processadas': 0}
         
-        while i < len(linhas):
-            linha_atual = linhas[i].rstrip()
-            linha_processada = False
-            
-            # Caso 1: Linha vazia - preservar como separador
-            if not linha_atual.strip():
-                linhas_processadas.append('')
-                i += 1
-                continue
-            
-            # Caso 2: Linha é um cabeçalho de seção
-            if padrao_secao.match(linha_atual.strip()):
-                # Adicionar uma linha em branco antes do cabeçalho se não for a primeira linha
-                if linhas_processadas and linhas_processadas[-1] != '':
-                    linhas_processadas.append('')
-                    
-                linhas_processadas.append(linha_atual)
-                secoes_formatadas += 1
-                
-                # Adicionar uma linha em branco após o cabeçalho
-                linhas_processadas.append('')
-                i += 1
-                linha_processada = True
-                continue
-            
-            # Caso 3: Início de definição de campo (usando padrão mais abrangente)
-            match = padrao_campo.match(linha_atual)
-            if not match:
-                match = padrao_campo_numerico.match(linha_atual)
-            if not match:
-                match = padrao_campo_tabela.match(linha_atual)
-                
-            if match:
-                nome_campo = match.group(1).strip()
-                tipo_campo = match.group(2).strip()
-                resto_linha = linha_atual[match.end():].strip()
-                
-                # Iniciar o campo formatado
-                if formato == FormatoSaida.ESTRUTURADO:
-                    campo_formatado = f"{nome_campo}\n    Tipo: {tipo_campo}"
-                    
-                    # Continuar lendo as próximas linhas até encontrar outro campo ou seção
-                    descricao_campo = resto_linha
-                    j = i + 1
-                    
-                    # Modificação: verificamos linhas até encontrar próximo campo, seção, ou linha vazia seguida de algo que parece um campo
-                    while j < len(linhas):
-                        linha_j = linhas[j].strip()
-                        
-                        # Se encontrarmos padrão de início de campo, paramos
-                        if padrao_campo.match(linha_j) or padrao_campo_numerico.match(linha_j) or padrao_campo_tabela.match(linha_j):
-                            break
-                            
-                        # Se encontrarmos padrão de seção, paramos
-                        if padrao_secao.match(linha_j):
-                            break
-                            
-                        # Se for linha vazia seguida de algo que parece um campo, paramos
-                        if not linha_j and j+1 < len(linhas):
-                            prox_linha = linhas[j+1].strip()
-                            # Verificar se a próxima linha não-vazia parece o início de um campo
-                            if re.match(r'^[0-9]+[\-\.]', prox_linha):
-                                break
-                        
-                        # Se chegou aqui, a linha atual é parte da descrição do campo
-                        if linha_j:  # Se não for linha vazia
-                            descricao_campo += " " + linha_j
-                        
-                        j += 1
-                    
-                    # Adicionar a descrição formatada
-                    if descricao_campo:
-                        # MELHORIA: Identificar partes da descrição com mais precisão
-                        # Incluir mais padrões de metadados
-                        partes = re.split(r'(Descrição:|Características DBF:|Campo Obrigatório|Campo Essencial|Campo Interno|Campo Opcional)', 
-                                         descricao_campo)
-                        
-                        # Formatar cada parte adequadamente
-                        for k in range(0, len(partes), 2):
-                            prefixo = partes[k-1] if k > 0 else ""
-                            texto = partes[k].strip() if k < len(partes) else ""
-                            
-                            if prefixo:
-                                campo_formatado += f"\n    {prefixo} {texto}"
-                            elif texto:
-                                campo_formatado += f"\n    {texto}"
-                    
-                    linhas_processadas.append(campo_formatado)
-                    campos_formatados += 1
-                    
-                elif formato == FormatoSaida.MARKDOWN:
-                    # Formato Markdown com cabeçalho H3 para o nome do campo
-                    campo_formatado = f"### {nome_campo}\n\n**Tipo:** {tipo_campo}"
-                    
-                    # Processar descrição da mesma forma que acima
-                    descricao_campo = resto_linha
-                    j = i + 1
-                    
-                    while (j < len(linhas) and 
-                           not padrao_campo.match(linhas[j].strip()) and 
-                           not padrao_secao.match(linhas[j].strip())):
-                        
-                        if linhas[j].strip():
-                            descricao_campo += " " + linhas[j].strip()
-                        j += 1
-                    
-                    if descricao_campo:
-                        # Formato mais simples para Markdown
-                        partes = re.split(r'(Descrição:|Características DBF:|Campo Obrigatório|Campo Essencial|Campo Interno|Campo Opcional)', 
-                                         descricao_campo)
-                        
-                        for k in range(0, len(partes), 2):
-                            prefixo = partes[k-1] if k > 0 else ""
-                            texto = partes[k].strip() if k < len(partes) else ""
-                            
-                            if prefixo:
-                                campo_formatado += f"\n\n**{prefixo.strip()}** {texto}"
-                            elif texto:
-                                campo_formatado += f"\n\n{texto}"
-                    
-                    linhas_processadas.append(campo_formatado)
-                    campos_formatados += 1
-                    
-                else:  # Formato TEXTO (simples)
-                    # Juntar todas as linhas relacionadas ao campo
-                    texto_completo = linha_atual
-                    j = i + 1
-                    
-                    while (j < len(linhas) and 
-                           not padrao_campo.match(linhas[j].strip()) and 
-                           not padrao_campo_numerico.match(linhas[j].strip()) and
-                           not padrao_campo_tabela.match(linhas[j].strip()) and
-                           not padrao_secao.match(linhas[j].strip())):
-                        
-                        if linhas[j].strip():
-                            texto_completo += " " + linhas[j].strip()
-                        j += 1
-                    
-                    linhas_processadas.append(texto_completo)
-                    campos_formatados += 1
-                
-                # Avançar para a próxima definição
-                i = j if j > i + 1 else i + 1
-                linha_processada = True
-                continue
-            
-            # Caso 4: Outras linhas - preservar como estão
-            if not linha_processada:
-                linhas_processadas.append(linha_atual)
-                linhas_nao_processadas += 1
-                i += 1
+        # 2. Processamento principal: Juntar linhas que pertencem ao mesmo campo,
+        # 3. gravando cada entrada no arquivo formatado assim que fica pronta
+        # (buffer de 1 MiB; entradas separadas por '\n', sem quebra após a última)
+        total_saida = 0
+        with open(arquivo_entrada, 'r', encoding='utf-8', buffering=1 << 20) as entrada, \
+             open(arquivo_saida, 'w', encoding='utf-8', buffering=1 << 20) as saida:
+            leitor = _LeitorLinhas(entrada)
+            for entrada_formatada in _gerar_saida(leitor, formato, estatisticas):
+                if total_saida:
+                    saida.write('\n')
+                saida.write(entrada_formatada)
+                total_saida += 1
         
         print(f"\nEstatísticas de formatação:")
-        print(f"  - Campos formatados: {campos_formatados}")
-        print(f"  - Seções formatadas: {secoes_formatadas}")
-        print(f"  - Linhas não processadas: {linhas_nao_processadas}")
-        
-        # 3. Salvar o resultado formatado
-        with open(arquivo_saida, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(linhas_processadas))
+        print(f"  - Campos formatados: {estatisticas['campos']}")
+        print(f"  - Seções formatadas: {estatisticas['secoes']}")
+        print(f"  - Linhas não processadas: {estatisticas['nao_processadas']}")
             
         print(f"Formatação concluída. Arquivo salvo em: {arquivo_saida}")
-        print(f"Linhas no arquivo original: {len(linhas)}, Linhas após formatação: {len(linhas_processadas)}")
+        print(f"Linhas no arquivo original: {leitor.total}, Linhas após formatação: {total_saida}")
         return True
         
     except Exception as e:
@@ -247,6 +398,92 @@ def formatar_dicionario(arquivo_entrada, arquivo_saida, formato=FormatoSaida.EST
         traceback.print_exc()
         return False
 
+# Abaixo deste número de linhas a análise é feita no próprio processo (o custo de
+# iniciar os processos de trabalho superaria o ganho)
+_LINHAS_MINIMAS_PARALELO = 50_000
+
+def _analisar_trecho(trecho):
+    """
+    Classifica um trecho contíguo de linhas em uma única passagem (executada em um
+    processo de trabalho quando o arquivo é grande).
+    
+    Args:
+        trecho: Tupla (índice da primeira linha no arquivo, linhas do trecho,
+                se a linha anterior ao trecho é vazia)
+    
+    Returns:
+        dict: Contadores, exemplos e candidatos do trecho, combinados por analisar_estrutura_dicionario
+    """
+    inicio, linhas, anterior_vazia = trecho
+    
+    # Cada linha é classificada uma vez e os contadores, exemplos e candidatos de todas
+    # as seções do relatório são acumulados ao mesmo tempo
+    linhas_vazias = 0
+    contagem_tipos = dict.fromkeys(_TIPOS_ANALISE, 0)
+    exemplos_tipos = {tipo: [] for tipo in _TIPOS_ANALISE}
+    total_secoes = 0
+    exemplos_secoes = []
+    campos_conhecidos = set()
+    candidatos = []
+    continuacoes = 0
+    tipos_encontrados = set()
+    
+    for i, linha in enumerate(linhas, inicio):
+        limpa = linha.strip()
+        if not limpa:
+            linhas_vazias += 1
+            anterior_vazia = True
+            continue
+        
+        # Extrair a parte que parece ser um tipo de campo
+        match = _PADRAO_TIPO.search(linha)
+        if match:
+            tipos_encontrados.add(match.group(1))
+        
+        # MELHORIA: Padrões mais abrangentes para identificar campos
+        # (uma linha pode casar com mais de um padrão e é contada em cada um)
+        comeca_com_digito = limpa[0].isdigit()
+        eh_campo = False
+        if comeca_com_digito:
+            for tipo, padrao in _PADROES_ANALISE:
+                if padrao.match(limpa):
+                    eh_campo = True
+                    contagem_tipos[tipo] += 1
+                    if len(exemplos_tipos[tipo]) < 3:
+                        exemplos_tipos[tipo].append(linha)
+        
+        # Tipos de campo sempre têm minúsculas, então um campo nunca é também um cabeçalho
+        eh_secao = _eh_secao(limpa)
+        if eh_secao:
+            total_secoes += 1
+            if len(exemplos_secoes) < 5:
+                exemplos_secoes.append(linha)
+        elif comeca_com_digito:
+            # NOVO: Possíveis campos que não foram reconhecidos (filtrados após a passagem)
+            match = _PADRAO_CAMPO_POTENCIAL.match(limpa)
+            if match:
+                nome = match.group(1).strip()
+                if eh_campo:
+                    campos_conhecidos.add(nome)
+                candidatos.append((i+1, limpa, nome))
+        
+        # Linhas que parecem ser continuações de campos (logo após uma linha vazia)
+        if anterior_vazia and not eh_campo and not eh_secao:
+            continuacoes += 1
+        anterior_vazia = False
+    
+    return {
+        'linhas_vazias': linhas_vazias,
+        'contagem_tipos': contagem_tipos,
+        'exemplos_tipos': exemplos_tipos,
+        'total_secoes': total_secoes,
+        'exemplos_secoes': exemplos_secoes,
+        'campos_conhecidos': campos_conhecidos,
+        'candidatos': candidatos,
+        'continuacoes': continuacoes,
+        'tipos_encontrados': tipos_encontrados,
+    }
+
 def analisar_estrutura_dicionario(arquivo):
     """
     Analisa a estrutura do arquivo para identificar padrões comuns e estatísticas.
@@ -255,68 +492,60 @@ def analisar_estrutura_dicionario(arquivo):
         arquivo: Caminho para o arquivo DICIONARIO.txt
     """
     try:
-        with open(arquivo, 'r', encoding='utf-8') as f:
-            conteudo = f.read()
-            
-        linhas = conteudo.split('\n')
-        total_linhas = len(linhas)
+        if os.path.getsize(arquivo) == 0:
+            print(f"\nAVISO: O arquivo {arquivo} está vazio, não há estrutura para analisar.")
+            return True
         
-        # Estatísticas básicas
-        linhas_vazias = sum(1 for linha in linhas if not linha.strip())
-        
-        # MELHORIA: Padrões mais abrangentes para identificar campos
-        padrao_campo_principal = re.compile(r'^([0-9]+[\-\.].+?)\s+(Varchar2?\(\d+\)|Date|Number\(\d+\))')
-        padrao_campo_numerico = re.compile(r'^([0-9]+[\-\.].+?)\s+(Número)')
-        padrao_campo_tabela = re.compile(r'^([0-9]+[\-\.].+?)\s+(Tabela)')
+        linhas = _ler_conteudo(arquivo).split('\n')
+        total_linhas = len(linhas)
         
-        # Encontrar campos usando todos os padrões
-        campos_tipo1 = [linha for linha in linhas if padrao_campo_principal.match(linha.strip())]
-        campos_tipo2 = [linha for linha in linhas if padrao_campo_numerico.match(linha.strip())]
-        campos_tipo3 = [linha for linha in linhas if padrao_campo_tabela.match(linha.strip())]
+        # Classificar as linhas: em arquivos grandes, trechos contíguos são processados em
+        # paralelo (um por CPU) e os resultados parciais são combinados na ordem original
+        if total_linhas < _LINHAS_MINIMAS_PARALELO:
+            resultados = [_analisar_trecho((0, linhas, False))]
+        else:
+            passo = -(-total_linhas // (os.cpu_count() or 1))
+            trechos = [(inicio, linhas[inicio:inicio + passo], inicio > 0 and not linhas[inicio - 1].strip())
+                       for inicio in range(0, total_linhas, passo)]
+            with Pool() as pool:
+                resultados = pool.map(_analisar_trecho, trechos)
         
-        total_campos = len(campos_tipo1) + len(campos_tipo2) + len(campos_tipo3)
+        # Estatísticas básicas
+        linhas_vazias = sum(r['linhas_vazias'] for r in resultados)
+        contagem_tipos = {tipo: sum(r['contagem_tipos'][tipo] for r in resultados) for tipo in _TIPOS_ANALISE}
+        exemplos_tipos = {tipo: [ex for r in resultados for ex in r['exemplos_tipos'][tipo]][:3]
+                          for tipo in _TIPOS_ANALISE}
+        total_secoes = sum(r['total_secoes'] for r in resultados)
+        exemplos_secoes = [ex for r in resultados for ex in r['exemplos_secoes']][:5]
+        continuacoes = sum(r['continuacoes'] for r in resultados)
+        todos_campos_conhecidos = set().union(*(r['campos_conhecidos'] for r in resultados))
+        tipos_encontrados = set().union(*(r['tipos_encontrados'] for r in resultados))
         
-        # Identificar possíveis cabeçalhos
-        padrao_secao = re.compile(r'^[A-ZÇÀÁÂÃÉÊÍÓÔÕÚÜ\s\-0-9]+$')
-        secoes = [linha for linha in linhas if padrao_secao.match(linha.strip()) and linha.strip()]
+        total_campos = sum(contagem_tipos.values())
+        campos_potenciais = [(num_linha, texto) for r in resultados for num_linha, texto, nome in r['candidatos']
+                             if nome not in todos_campos_conhecidos]
         
         print(f"\nAnálise da estrutura do arquivo {arquivo}:")
         print(f"Total de linhas: {total_linhas}")
         print(f"Linhas vazias: {linhas_vazias}")
         print(f"Campos identificados: {total_campos}")
-        print(f"  - Com tipos padrão (Varchar, Date, Number): {len(campos_tipo1)}")
-        print(f"  - Com tipo 'Número': {len(campos_tipo2)}")
-        print(f"  - Com tipo 'Tabela': {len(campos_tipo3)}")
-        print(f"Seções/cabeçalhos: {len(secoes)}")
-        
-        # NOVO: Identificar possíveis campos que não foram reconhecidos
-        possivel_campo_nao_reconhecido = re.compile(r'^([0-9]+[\-\.].+)')
-        todos_campos_conhecidos = set()
-        for campo in campos_tipo1 + campos_tipo2 + campos_tipo3:
-            match = possivel_campo_nao_reconhecido.match(campo.strip())
-            if match:
-                todos_campos_conhecidos.add(match.group(1).strip())
-        
-        campos_potenciais = []
-        for i, linha in enumerate(linhas):
-            match = possivel_campo_nao_reconhecido.match(linha.strip())
-            if match and match.group(1).strip() not in todos_campos_conhecidos:
-                # Verificar se não é um cabeçalho
-                if not padrao_secao.match(linha.strip()):
-                    campos_potenciais.append((i+1, linha.strip()))
+        print(f"  - Com tipos padrão (Varchar, Date, Number): {contagem_tipos['Padrão']}")
+        print(f"  - Com tipo 'Número': {contagem_tipos['Número']}")
+        print(f"  - Com tipo 'Tabela': {contagem_tipos['Tabela']}")
+        print(f"Seções/cabeçalhos: {total_secoes}")
         
         # Mostrar exemplos de campos
         print("\nExemplos de campos identificados:")
-        for tipo, nome in [("Padrão", campos_tipo1), ("Número", campos_tipo2), ("Tabela", campos_tipo3)]:
-            if nome:
+        for tipo, exemplos in exemplos_tipos.items():
+            if exemplos:
                 print(f"  Tipo {tipo}:")
-                for i, campo in enumerate(nome[:3]):
+                for i, campo in enumerate(exemplos):
                     print(f"    {i+1}. {campo[:100]}{'...' if len(campo) > 100 else ''}")
         
         # Mostrar exemplos de seções
-        if secoes:
+        if exemplos_secoes:
             print("\nExemplos de seções/cabeçalhos:")
-            for i, secao in enumerate(secoes[:5]):
+            for i, secao in enumerate(exemplos_secoes):
                 print(f"  {i+1}. {secao}")
         
         # NOVO: Mostrar campos potenciais não reconhecidos
@@ -330,32 +559,13 @@ def analisar_estrutura_dicionario(arquivo):
         # Identificar possíveis problemas
         print("\nPossíveis problemas identificados:")
         
-        # Verificar linhas que parecem ser continuações de campos
-        continuacoes = 0
-        for i in range(1, len(linhas)):
-            if (linhas[i].strip() and 
-                not padrao_campo_principal.match(linhas[i].strip()) and
-                not padrao_campo_numerico.match(linhas[i].strip()) and
-                not padrao_campo_tabela.match(linhas[i].strip()) and
-                not padrao_secao.match(linhas[i].strip()) and 
-                not linhas[i-1].strip()):
-                continuacoes += 1
-        
         if continuacoes > 0:
             print(f"  - Aproximadamente {continuacoes} linhas parecem ser continuações de campos")
             
         # NOVO: Verificar a variação nos tipos de campos
-        if linhas:
-            tipos_encontrados = set()
-            for linha in linhas:
-                # Extrair a parte que parece ser um tipo de campo
-                match = re.search(r'\s+(Varchar2?\(\d+\)|Date|Number\(\d+\)|Número|Varchar2?|Tabela|[A-Z][a-z]+)\s+', linha)
-                if match:
-                    tipos_encontrados.add(match.group(1))
-            
-            print(f"  - {len(tipos_encontrados)} tipos diferentes de campos encontrados:")
-            for tipo in sorted(tipos_encontrados):
-                print(f"    * {tipo}")
+        print(f"  - {len(tipos_encontrados)} tipos diferentes de campos encontrados:")
+        for tipo in sorted(tipos_encontrados):
+            print(f"    * {tipo}")
         
         return True
                 
@@ -394,4 +604,4 @@ if __name__ == "__main__":
         formato = FormatoSaida(args.formato)
         print(f"Processando arquivo: {args.entrada}")
         print(f"Arquivo de saída será: {args.saida}")
-        formatar_dicionario(args.entrada, args.saida, formato)
+        formatar_dicionario(args.entrada, args.saida, formato, verificar_arquivo=False)
@@ -11,23 +11,177 @@ Este script integra:
   - Exportação dos dados tratados para arquivo CSV
 """
 
+import csv
+import functools
+import glob
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+# Mensagens de progresso do processamento (configuradas no bloco principal; as mensagens
+# por coluna usam o nível DEBUG)
+logger = logging.getLogger(__name__)
+
+# Campos de data – acrescente ou remova conforme sua base
+_CAMPOS_DATA = (
+    'DT_NOTIFIC', 'DT_SIN_PRI', 'DT_NASC', 'DT_INTERNA', 'DT_ENTUTI',
+    'DT_SAIDUTI', 'DT_EVOLUCA', 'DT_ENCERRA', 'DOSE_1_COV', 'DOSE_2_COV',
+    'DOSE_REF', 'DT_RAIOX', 'DT_TOMO', 'DT_COLETA', 'DT_RES_AN',
+    'DT_PCR', 'DT_CO_SOR', 'DT_RES', 'DT_DIGITA'
+)
+
+# Prefixos dos demais campos de data do dicionário (DT_VAC_MAE, DT_1_DOSE, DOSE_2REF...),
+# também convertidos quando presentes no arquivo
+_PREFIXOS_DATA = ('DT_', 'DOSE_')
+
+def _campos_data(colunas):
+    """
+    Campos de data presentes em `colunas`: os de _CAMPOS_DATA, na ordem dessa lista, seguidos
+    das demais colunas com prefixo de data, na ordem do arquivo.
+    """
+    colunas = list(colunas)
+    presentes = set(colunas)
+    return tuple([campo for campo in _CAMPOS_DATA if campo in presentes] +
+                 [col for col in colunas if col.startswith(_PREFIXOS_DATA) and col not in _CAMPOS_DATA])
+
+# Formato das datas nos arquivos do SIVEP-Gripe
+_FORMATO_DATA = '%d/%m/%Y'
+
+# Tamanho dos blocos lidos e convertidos por thread pelo leitor CSV do PyArrow
+_TAMANHO_BLOCO_CSV = 64 << 20
+
+def _opcoes_csv_pyarrow(encoding, sep, block_size, colunas_texto=_CAMPOS_DATA):
+    """
+    Monta as opções de leitura, parse e conversão do leitor CSV do PyArrow.
+    
+    Linhas com número de campos incorreto são ignoradas, como em on_bad_lines='warn'.
+    As colunas em `colunas_texto` são sempre lidas como texto.
+    
+    Returns:
+        tuple: (ReadOptions, ParseOptions, ConvertOptions)
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    
+    opcoes_leitura = pacsv.ReadOptions(encoding=encoding, block_size=block_size)
+    # Valores entre aspas com quebras de linha (campos de texto livre, como OUTRO_DES)
+    # são aceitos: sem newlines_in_values, o leitor perde a sincronia entre os blocos
+    opcoes_parse = pacsv.ParseOptions(delimiter=sep, newlines_in_values=True,
+                                      invalid_row_handler=lambda linha: 'skip')
+    # Textos vazios (e os marcadores usuais, como 'NA') viram nulos, como no pandas
+    opcoes_conversao = pacsv.ConvertOptions(
+        strings_can_be_null=True,
+        column_types={campo: pa.string() for campo in colunas_texto}
+    )
+    return opcoes_leitura, opcoes_parse, opcoes_conversao
+
+def _ler_csv_pyarrow(caminho_arquivo, encoding, sep, colunas=None):
+    """
+    Lê o CSV com pyarrow.csv.read_csv, que tokeniza e converte os blocos em paralelo.
+    
+    O resultado usa os mesmos tipos ArrowDtype de pd.read_csv(dtype_backend='pyarrow').
+    Os campos de data (ver _campos_data) são mantidos como texto (o PyArrow converteria
+    datas ISO por conta própria); a conversão é feita em criar_campos_calculados.
+    Se `colunas` for informado, apenas essas colunas são convertidas e carregadas.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    
+    opcoes_leitura, opcoes_parse, opcoes_conversao = _opcoes_csv_pyarrow(encoding, sep, _TAMANHO_BLOCO_CSV)
+    
+    # Descobrir os nomes das colunas lendo só o primeiro bloco, mantendo a ordem do arquivo:
+    # campos de data fora de _CAMPOS_DATA e a projeção (include_columns exige colunas existentes)
+    opcoes_cabecalho = pacsv.ReadOptions(encoding=encoding, block_size=1 << 20)
+    nomes = pacsv.open_csv(caminho_arquivo, read_options=opcoes_cabecalho,
+                           parse_options=opcoes_parse).schema.names
+    opcoes_conversao.column_types = {campo: pa.string() for campo in _campos_data(nomes)}
+    if colunas is not None:
+        opcoes_conversao.include_columns = [nome for nome in nomes if nome in colunas]
+    tabela = pacsv.read_csv(caminho_arquivo, read_options=opcoes_leitura,
+                            parse_options=opcoes_parse, convert_options=opcoes_conversao)
+    return tabela.to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+
+def _caminho_cache(caminho_arquivo, encoding, sep):
+    """
+    Retorna o caminho do cache Parquet do arquivo, ou None se o PyArrow não estiver disponível.
+    
+    O nome inclui a data de modificação do arquivo de origem (em nanossegundos), de modo
+    que qualquer alteração no arquivo gera um novo cache e invalida o anterior, e um
+    resumo da codificação e do separador usados na leitura: cada combinação tem o seu cache.
+    """
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    opcoes = hashlib.sha1(f"{encoding}\0{sep}".encode('utf-8')).hexdigest()[:8]
+    return f"{caminho_arquivo}.{os.stat(caminho_arquivo).st_mtime_ns}.{opcoes}.parquet"
+
+def _salvar_cache(df, caminho_arquivo, cache):
+    """Grava o DataFrame carregado no cache Parquet e remove caches antigos do mesmo arquivo."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), cache, compression='zstd')
+    except (pa.ArrowException, OSError) as e:
+        logger.warning("Não foi possível gravar o cache %s: %s", cache, e)
+        return
+    # Apenas caches deste arquivo gravados para versões anteriores dele (nome terminado em
+    # .<st_mtime_ns>[.<opções>].parquet, com outra data): caches da versão atual com outra
+    # codificação ou separador e outros arquivos .parquet com o mesmo prefixo são mantidos
+    prefixo = f"{caminho_arquivo}."
+    mtime_ns = str(os.stat(caminho_arquivo).st_mtime_ns)
+    for antigo in glob.glob(f"{glob.escape(caminho_arquivo)}.*.parquet"):
+        nome = re.fullmatch(r'(\d+)(\.[0-9a-f]{8})?', antigo[len(prefixo):-len('.parquet')])
+        if antigo != cache and nome and (nome.group(1) != mtime_ns or nome.group(2) is None):
+            try:
+                os.remove(antigo)
+            except OSError:
+                pass
+    logger.info("Cache Parquet gravado em %s", cache)
+
 # Função para carregar os dados (DBF, CSV ou Excel)
-def carregar_dados(caminho_arquivo, encoding='latin1', sep=';', chunksize=None):
+# (colunas: se informado, carrega apenas as colunas desse conjunto, por exemplo _COLUNAS_UTILIZADAS)
+def carregar_dados(caminho_arquivo, encoding='latin1', sep=';', chunksize=None, usar_cache=False, colunas=None):
+    # Cache Parquet do arquivo já convertido (usar_cache=True): evita refazer a leitura do
+    # DBF/CSV a cada execução (usado apenas quando todas as colunas são carregadas)
+    cache = None
+    if usar_cache and not chunksize and colunas is None and caminho_arquivo.lower().endswith(('.dbf', '.csv', '.csv.gz', '.csv.zip', '.csv.bz2')):
+        cache = _caminho_cache(caminho_arquivo, encoding, sep)
+        if cache and os.path.exists(cache):
+            import pyarrow.parquet as pq
+            df = pq.read_table(cache).to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+            logger.info("Dados carregados do cache %s! Total de registros: %s", cache, len(df))
+            return df
+    
     if caminho_arquivo.lower().endswith('.dbf'):
         try:
             from dbfread import DBF
-            tabela = DBF(caminho_arquivo, encoding=encoding)
-            df = pd.DataFrame(iter(tabela))
+            # Registros lidos do disco um a um (load=False), acumulados em uma lista por campo:
+            # o DataFrame é montado coluna a coluna, sem inspecionar cada dicionário de registro
+            tabela = DBF(caminho_arquivo, encoding=encoding, load=False)
+            campos = [campo for campo in tabela.field_names if colunas is None or campo in colunas]
+            dados = {campo: [] for campo in campos}
+            anexadores = [(campo, dados[campo].append) for campo in campos]
+            for registro in tabela:
+                for campo, anexar in anexadores:
+                    anexar(registro[campo])
+            df = pd.DataFrame(dados, copy=False)
         except ImportError:
-            print("Instale a biblioteca dbfread: pip install dbfread")
+            logger.error("Instale a biblioteca dbfread: pip install dbfread")
             return None
     elif caminho_arquivo.lower().endswith(('.csv', '.csv.gz', '.csv.zip', '.csv.bz2')):
         # Otimizações avançadas para CSV
-        print(f"Iniciando carregamento do arquivo CSV: {caminho_arquivo}")
+        logger.info("Iniciando carregamento do arquivo CSV: %s", caminho_arquivo)
         compression = 'infer'  # Detecta automaticamente se o arquivo está comprimido
         
         # Configurações padrão para CSV
@@ -39,11 +193,13 @@ def carregar_dados(caminho_arquivo, encoding='latin1', sep=';', chunksize=None):
             'compression': compression,
             'on_bad_lines': 'warn'  # Não interrompe o processamento por linhas problemáticas
         }
+        if colunas is not None:
+            csv_opts['usecols'] = lambda col: col in colunas
         
         try:
             # Para arquivos grandes, usar leitura em chunks e/ou pyarrow
             if chunksize:
-                print(f"Carregando arquivo CSV em partes de {chunksize} linhas...")
+                logger.info("Carregando arquivo CSV em partes de %s linhas...", chunksize)
                 csv_opts['chunksize'] = chunksize
                 return pd.read_csv(**csv_opts)
             else:
@@ -51,28 +207,39 @@ def carregar_dados(caminho_arquivo, encoding='latin1', sep=';', chunksize=None):
                 try:
                     import pyarrow
                     csv_opts['dtype_backend'] = 'pyarrow'
-                    print("Usando pyarrow para otimização de memória e desempenho")
+                    logger.info("Usando pyarrow para otimização de memória e desempenho")
                 except ImportError:
-                    print("PyArrow não disponível. Para melhor desempenho, instale: pip install pyarrow")
+                    logger.warning("PyArrow não disponível. Para melhor desempenho, instale: pip install pyarrow")
                 
-                df = pd.read_csv(**csv_opts)
-                print(f"Arquivo CSV carregado com {len(df)} linhas e {len(df.columns)} colunas")
+                df = None
+                if 'dtype_backend' in csv_opts:
+                    # Leitor CSV multithread do PyArrow; em caso de falha, seguir com o pandas
+                    try:
+                        df = _ler_csv_pyarrow(caminho_arquivo, encoding, sep, colunas)
+                    except (pyarrow.ArrowException, UnicodeDecodeError) as e:
+                        logger.warning("Leitura com pyarrow.csv falhou (%s); usando pandas.read_csv", e)
+                if df is None:
+                    df = pd.read_csv(**csv_opts)
+                logger.info("Arquivo CSV carregado com %s linhas e %s colunas", len(df), len(df.columns))
         except Exception as e:
-            print(f"Erro ao carregar CSV com configuração padrão: {e}")
-            print("Tentando configurações alternativas...")
+            logger.warning("Erro ao carregar CSV com configuração padrão: %s", e)
+            logger.info("Tentando configurações alternativas...")
+            # O resultado de uma configuração alternativa não corresponde à codificação e ao
+            # separador pedidos: não é gravado no cache
+            cache = None
             
             # Tentativa 1: Mudar encoding para UTF-8
             try:
                 csv_opts['encoding'] = 'utf-8'
                 df = pd.read_csv(**csv_opts)
-                print("Sucesso usando encoding UTF-8")
+                logger.info("Sucesso usando encoding UTF-8")
             except Exception:
                 # Tentativa 2: Testar com vírgula como separador
                 try:
                     csv_opts['encoding'] = encoding  # Voltar ao encoding original
                     csv_opts['sep'] = ','
                     df = pd.read_csv(**csv_opts)
-                    print("Sucesso usando vírgula como separador")
+                    logger.info("Sucesso usando vírgula como separador")
                 except Exception:
                     # Tentativa 3: Usar configurações mais permissivas
                     try:
@@ -80,21 +247,32 @@ def carregar_dados(caminho_arquivo, encoding='latin1', sep=';', chunksize=None):
                         csv_opts['engine'] = 'python'  # Engine mais flexível
                         csv_opts['on_bad_lines'] = 'skip'  # Pular linhas problemáticas
                         df = pd.read_csv(**csv_opts)
-                        print("Sucesso usando configurações flexíveis e auto-detecção")
+                        logger.info("Sucesso usando configurações flexíveis e auto-detecção")
                     except Exception as final_e:
-                        print(f"Todas as tentativas falharam. Erro final: {final_e}")
+                        logger.error("Todas as tentativas falharam. Erro final: %s", final_e)
                         return None
     elif caminho_arquivo.lower().endswith(('.xlsx','.xls')):
-        df = pd.read_excel(caminho_arquivo)
+        df = pd.read_excel(caminho_arquivo, usecols=(lambda col: col in colunas) if colunas is not None else None)
     else:
-        print("Formato não suportado. Utilize DBF, CSV ou Excel.")
+        logger.error("Formato não suportado. Utilize DBF, CSV ou Excel.")
         return None
 
-    print(f"Dados carregados com sucesso! Total de registros: {len(df)}")
+    logger.info("Dados carregados com sucesso! Total de registros: %s", len(df))
+    if colunas is not None:
+        logger.info("Carregadas apenas as %s colunas utilizadas no processamento", len(df.columns))
+        logger.debug("Colunas solicitadas ausentes no arquivo: %s", sorted(set(colunas) - set(df.columns)))
+    if cache:
+        _salvar_cache(df, caminho_arquivo, cache)
     return df
 
 # Função para remover colunas com valores nulos
-def remover_colunas_nulas(df, threshold=1.0):
+def _nulos_arrow(serie):
+    """Quantidade de nulos de uma coluna ArrowDtype, lida dos metadados do array do PyArrow."""
+    import pyarrow as pa
+    
+    return pa.array(serie.array).null_count
+
+def remover_colunas_nulas(df, threshold=1.0, inplace=False):
     """
     Remove colunas que possuem percentual de valores nulos acima do threshold.
     
@@ -102,443 +280,1069 @@ def remover_colunas_nulas(df, threshold=1.0):
         df (pandas.DataFrame): DataFrame a ser processado
         threshold (float): Valor entre 0 e 1 que define o percentual mínimo de valores nulos
                           para remover a coluna. Default 1.0 (100% nulos)
+        inplace (bool): Se True, remove as colunas do próprio `df`. Default False
     
     Retorna:
-        pandas.DataFrame: DataFrame sem as colunas removidas
+        pandas.DataFrame: DataFrame sem as colunas removidas (o próprio `df` se inplace=True)
     """
-    # Calcular percentual de valores nulos em cada coluna
-    percentual_nulos = df.isnull().mean()
+    # Calcular percentual de valores nulos em cada coluna sem criar a matriz booleana de
+    # isnull(): colunas do PyArrow já guardam a quantidade de nulos (null_count); nas demais,
+    # usa-se a contagem de não nulos
+    nulos = [_nulos_arrow(df.iloc[:, i]) if isinstance(tipo, pd.ArrowDtype) else len(df) - df.iloc[:, i].count()
+             for i, tipo in enumerate(df.dtypes)]
+    percentual_nulos = pd.Series(nulos, index=df.columns, dtype=np.float64) / len(df)
     
     # Identificar colunas a serem removidas (acima do threshold)
     colunas_remover = percentual_nulos[percentual_nulos >= threshold].index.tolist()
     
     if colunas_remover:
-        print(f"Removendo {len(colunas_remover)} colunas com {threshold*100}% ou mais de valores nulos:")
-        print(f"  {', '.join(colunas_remover[:10])}" + ("..." if len(colunas_remover) > 10 else ""))
+        logger.info("Removendo %s colunas com %s%% ou mais de valores nulos:", len(colunas_remover), threshold*100)
+        logger.info("  %s%s", ', '.join(colunas_remover[:10]), "..." if len(colunas_remover) > 10 else "")
+        if inplace:
+            df.drop(columns=colunas_remover, inplace=True)
+            return df
         return df.drop(columns=colunas_remover)
     else:
-        print(f"Nenhuma coluna com {threshold*100}% ou mais de valores nulos encontrada.")
+        logger.info("Nenhuma coluna com %s%% ou mais de valores nulos encontrada.", threshold*100)
         return df
 
+def _eh_texto_arrow(dtype):
+    """Indica se o dtype é uma coluna de texto do PyArrow (ArrowDtype string/large_string)."""
+    if not isinstance(dtype, pd.ArrowDtype):
+        return False
+    import pyarrow as pa
+    return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+
+def _normalizar_texto_arrow(serie):
+    """
+    Remove espaços das bordas e converte para maiúsculas com os kernels do pyarrow.compute.
+    
+    Opera diretamente sobre o buffer UTF-8 da coluna, sem criar objetos str do Python;
+    valores nulos continuam nulos.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    valores = pc.utf8_upper(pc.utf8_trim_whitespace(pa.array(serie.array)))
+    return pd.Series(pd.arrays.ArrowExtensionArray(valores), index=serie.index, name=serie.name)
+
+def _normalizar_texto_objeto(serie):
+    """
+    Equivale a `serie.astype(str).str.strip().str.upper()` para colunas de objetos.
+    
+    Com o dtype str do pandas 3 os métodos .str já usam os kernels do PyArrow. Quando
+    astype(str) resulta em objetos (pandas 2), os textos passam uma única vez para um
+    StringArray do PyArrow, são tratados pelos mesmos kernels e voltam como objetos,
+    em vez de chamar strip() e upper() elemento a elemento.
+    """
+    texto = serie.astype(str)
+    if texto.dtype != object:
+        return texto.str.strip().str.upper()
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return texto.str.strip().str.upper()
+    
+    valores = pc.utf8_upper(pc.utf8_trim_whitespace(pa.array(texto.to_numpy(), type=pa.string())))
+    return pd.Series(valores.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name, dtype=object)
+
 # Função para limpar os dados (remoção de duplicatas e padronização de textos)
-def limpar_dados(df):
-    df_limpo = df.drop_duplicates()
-    print(f"Duplicatas removidas: {len(df) - len(df_limpo)}")
+def limpar_dados(df, dedup_key=None, inplace=False):
+    """
+    Remove duplicatas e colunas totalmente nulas e padroniza os textos.
+    
+    Parâmetros:
+        df (pandas.DataFrame): DataFrame a ser processado
+        dedup_key (list): Colunas que identificam um registro (por exemplo
+                          ['NU_NOTIFIC', 'DT_NOTIFIC']); apenas elas são comparadas na
+                          remoção de duplicatas, mantendo a primeira ocorrência. As colunas
+                          ausentes no DataFrame são ignoradas. Default None (registros
+                          idênticos em todas as colunas)
+        inplace (bool): Se True, altera e retorna o próprio `df`, de modo que os dados
+                        originais são liberados logo após a remoção de duplicatas, em vez
+                        de coexistirem com as cópias até o fim da limpeza. Default False
+    """
+    colunas = set(df.columns)
+    chave = [col for col in dedup_key if col in colunas] if dedup_key else []
+    opcoes = {'subset': chave, 'keep': 'first'} if chave else {}
+    registros_antes = len(df)
+    if inplace:
+        df.drop_duplicates(inplace=True, **opcoes)
+        df_limpo = df
+    else:
+        df_limpo = df.drop_duplicates(**opcoes)
+    logger.info("Duplicatas removidas: %s", registros_antes - len(df_limpo))
     
     # Remover colunas completamente nulas
     colunas_antes = len(df_limpo.columns)
-    df_limpo = remover_colunas_nulas(df_limpo)
-    print(f"Colunas removidas por conterem apenas valores nulos: {colunas_antes - len(df_limpo.columns)}")
+    df_limpo = remover_colunas_nulas(df_limpo, inplace=inplace)
+    logger.info("Colunas removidas por conterem apenas valores nulos: %s", colunas_antes - len(df_limpo.columns))
     
-    # Converter todas as colunas de texto para maiúsculas e sem espaços
-    for col in df_limpo.select_dtypes(include=['object']).columns:
+    return padronizar_textos(df_limpo)
+
+# Função para converter todas as colunas de texto para maiúsculas e sem espaços
+def padronizar_textos(df):
+    # As colunas de texto são identificadas pelos dtypes, percorridos uma única vez (as
+    # lidas pelo PyArrow já chegam como ArrowDtype string), sem select_dtypes nem acessar
+    # as colunas que não são de texto
+    for col, tipo in list(df.dtypes.items()):
         try:
-            df_limpo[col] = df_limpo[col].astype(str).str.strip().str.upper()
+            if _eh_texto_arrow(tipo):
+                df[col] = _normalizar_texto_arrow(df[col])
+            elif tipo == object or tipo == 'str':  # 'str': texto padrão do pandas 3
+                df[col] = _normalizar_texto_objeto(df[col])
         except Exception as e:
-            print(f"Erro ao tratar coluna {col}: {e}")
-    return df_limpo
+            logger.error("Erro ao tratar coluna %s: %s", col, e)
+    return df
 
 # Example fix for column name mismatches
+_RENAME_MAP = MappingProxyType({
+    'FAB_COV_1': 'FAB_COV1',
+    'FAB_COV_2': 'FAB_COV2',
+    'FAB_COVREF': 'FAB_COVRF'
+})
+
 def standardize_column_names(df):
-    rename_map = {
-        'FAB_COV_1': 'FAB_COV1',
-        'FAB_COV_2': 'FAB_COV2',
-        'FAB_COVREF': 'FAB_COVRF'
-    }
     # Only rename columns that exist
-    cols_to_rename = {k: v for k, v in rename_map.items() if k in df.columns}
+    cols_set = set(df.columns)
+    cols_to_rename = {k: v for k, v in _RENAME_MAP.items() if k in cols_set}
     if cols_to_rename:
         df = df.rename(columns=cols_to_rename)
-        print(f"Renamed columns: {list(cols_to_rename.keys())}")
+        logger.info("Renamed columns: %s", list(cols_to_rename.keys()))
+    return df
+
+# Dicionário de mapeamento atualizado conforme DICIONARIO.txt oficial (19/09/2022)
+_CATEGORIAS = {
+    # Dados de Identificação e Notificação
+    "NU_NOTIFIC": {},   # Número do registro (numérico/alfanumérico – não mapeamos)
+    "DT_NOTIFIC": {},   # Data de notificação (será convertida)
+    "SEM_NOT": {},      # Semana epidemiológica calculada (interno)
+    "DT_SIN_PRI": {},   # Data dos primeiros sintomas (será convertida)
+    "SEM_PRI": {},      # Semana epidemiológica dos sintomas (interno)
+    "SG_UF_NOT": {},    # UF de notificação (tabela IBGE)
+    "ID_REGIONA": {},   # Região de saúde de notificação (tabela IBGE)
+    "CO_REGIONA": {},   # Código da região de notificação (tabela IBGE)
+    "ID_MUNICIP": {},   # Município de notificação (tabela IBGE)
+    "CO_MUN_NOT": {},   # Código do município de notificação (tabela IBGE)
+    "ID_UNIDADE": {},   # Unidade de saúde (tabela CNES)
+
+    # Dados do Paciente 
+    "TEM_CPF": {'1': "Sim", '2': "Não"},
+    "ESTRANG": {'1': "Sim", '2': "Não"},
+    "CS_SEXO": {'1': "Masculino", '2': "Feminino", '9': "Ignorado"},
+    "DT_NASC": {},      # Data de nascimento (será convertida)
+    "NU_IDADE_N": {},   # Idade informada (numérica)
+    "TP_IDADE": {'1': "Dia", '2': "Mês", '3': "Ano"},
+    # COD_IDADE não foi encontrado no dicionário
+    "CS_GESTANT": {'1': "1º Trimestre", '2': "2º Trimestre", '3': "3º Trimestre",
+                   '4': "Idade Gestacional Ignorada", '5': "Não", '6': "Não se aplica", '9': "Ignorado"},
+    "CS_RACA": {'1': "Branca", '2': "Preta", '3': "Amarela", '4': "Parda", '5': "Indígena", '9': "Ignorado"},
+    "CS_ESCOL_N": {'0': "Sem escolaridade/Analfabeto",
+                   '1': "Fundamental 1º ciclo (1ª a 5ª série)",
+                   '2': "Fundamental 2º ciclo (6ª a 9ª série)",
+                   '3': "Médio (1º ao 3º ano)",
+                   '4': "Superior",
+                   '5': "Não se aplica",
+                   '9': "Ignorado"},
+    "ID_PAIS": {},      # País de residência (tabela de países)
+    "SG_UF": {},        # UF de residência (tabela IBGE)
+    "ID_RG_RESI": {},   # Região de saúde de residência (tabela IBGE)
+    "CO_RG_RESI": {},   # Código região de residência (tabela IBGE)
+    "ID_MN_RESI": {},   # Município de residência (tabela IBGE)
+    # SURTO_SG não foi encontrado no dicionário
+
+    # Dados de Notificação Adicionais e de Contato
+    "NOSOCOMIAL": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Caso nosocomial (infecção hospitalar)
+    "AVE_SUINO": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Contato com aves ou suínos
+    "OUT_ANIM": {},     # Descrição de outro animal (se aplicável)
+
+    # Sinais e Sintomas (todos usam o mesmo mapeamento)
+    "FEBRE": {'1': "Sim", '2': "Não", '9': "Ignorado"},
+    "TOSSE": {'1': "Sim", '2': "Não", '9': "Ignorado"},
+    "GARGANTA": {'1': "Sim", '2': "Não", '9': "Ignorado"},    # Dor de garganta
+    "DISPNEIA": {'1': "Sim", '2': "Não", '9': "Ignorado"},    # Dificuldade para respirar
+    "DESC_RESP": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Desconforto respiratório
+    "SATURACAO": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Saturação O2 < 95%
+    "DIARREIA": {'1': "Sim", '2': "Não", '9': "Ignorado"},
+    "VOMITO": {'1': "Sim", '2': "Não", '9': "Ignorado"},
+    "DOR_ABD": {'1': "Sim", '2': "Não", '9': "Ignorado"},     # Dor abdominal
+    "FADIGA": {'1': "Sim", '2': "Não", '9': "Ignorado"},
+    "PERD_OLFT": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Perda do olfato
+    "PERD_PALA": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Perda do paladar
+    "OUTRO_SIN": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Outros sintomas
+    "OUTRO_DES": {},    # Descrição de outros sintomas
+
+    # Fatores de Risco (todos usam o mesmo mapeamento)
+    "FATOR_RISC": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Tem fator de risco
+    "PUERPERA": {'1': "Sim", '2': "Não", '9': "Ignorado"},    # Puérpera (até 45 dias após parto)
+    "CARDIOPATI": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Doença cardiovascular crônica
+    "HEMATOLOGI": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Doença hematológica crônica
+    "SIND_DOWN": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Síndrome de Down
+    "HEPATICA": {'1': "Sim", '2': "Não", '9': "Ignorado"},    # Doença hepática crônica
+    "ASMA": {'1': "Sim", '2': "Não", '9': "Ignorado"},
+    "DIABETES": {'1': "Sim", '2': "Não", '9': "Ignorado"},
+    "NEUROLOGIC": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Doença neurológica crônica
+    "PNEUMOPATI": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Pneumopatia crônica
+    "IMUNODEPRE": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Imunodeficiência/Imunodepressão
+    "RENAL": {'1': "Sim", '2': "Não", '9': "Ignorado"},       # Doença renal crônica
+    "OBESIDADE": {'1': "Sim", '2': "Não", '9': "Ignorado"},
+    "OBES_IMC": {},     # Valor do IMC (numérico)
+    "OUT_MORBI": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Outros fatores de risco
+    "MORB_DESC": {},    # Descrição de outros fatores de risco
+
+    # Vacinação contra Gripe e COVID-19
+    "VACINA": {'1': "Sim", '2': "Não", '9': "Ignorado"},      # Recebeu vacina contra gripe
+    "DT_UT_DOSE": {},   # Data da última dose de vacina (será convertida)
+    "VACINA_COV": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Recebeu vacina COVID-19
+    "DOSE_1_COV": {},   # Data da 1ª dose COVID-19 (será convertida)
+    "DOSE_2_COV": {},   # Data da 2ª dose COVID-19 (será convertida)
+    "DOSE_REF": {},     # Data da dose reforço COVID-19 (será convertida)
+    "FAB_COV_1": {},    # Fabricante da 1ª dose COVID-19
+    "FAB_COV_2": {},    # Fabricante da 2ª dose COVID-19
+    "FAB_COVREF": {},   # Fabricante da dose reforço COVID-19
+    "LAB_PR_COV": {},   # Lab.produtor da vacina - não há mapeamento no dicionário
+
+    # Tratamento - Antiviral
+    "ANTIVIRAL": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Usou antiviral para gripe
+    "TP_ANTIVIR": {'1': "Oseltamivir", '2': "Zanamivir", '3': "Outro"},
+
+    # Internação e UTI
+    "DT_INTERNA": {},   # Data da internação (será convertida)
+    "SG_UF_INTE": {},   # UF de internação (tabela IBGE)
+    "ID_RG_INTE": {},   # Região de saúde de internação (tabela IBGE)
+    "CO_RG_INTE": {},   # Código da região de internação (tabela IBGE)
+    "ID_MN_INTE": {},   # Município de internação (tabela IBGE)
+    "CO_MU_INTE": {},   # Código do município de internação (tabela IBGE)
+    "UTI": {'1': "Sim", '2': "Não", '9': "Ignorado"},         # Internado em UTI
+    "DT_ENTUTI": {},    # Data de entrada na UTI (será convertida)
+    "DT_SAIDUTI": {},   # Data de saída da UTI (será convertida)
+    "SUPORT_VEN": {'1': "Sim, invasivo", '2': "Sim, não invasivo", '3': "Não", '9': "Ignorado"},
+
+    # Exames radiológicos
+    "RAIOX_RES": {'1': "Normal", '2': "Infiltrado intersticial", '3': "Consolidação",
+                  '4': "Misto", '5': "Outro", '6': "Não realizado", '9': "Ignorado"},
+    "RAIOX_OUT": {},    # Descrição de outro resultado de RX
+    "DT_RAIOX": {},     # Data do RX (será convertida)
+    "TOMO_RES": {'1': "Típico COVID-19", '2': "Indeterminado COVID-19",
+                 '3': "Atípico COVID-19", '4': "Negativo para Pneumonia",
+                 '5': "Outro", '6': "Não realizado", '9': "Ignorado"},
+    "TOMO_OUT": {},     # Descrição de outro resultado de tomografia
+    "DT_TOMO": {},      # Data da tomografia (será convertida)
+
+    # Teste Diagnóstico - Amostra e Coleta
+    "AMOSTRA": {'1': "Sim", '2': "Não", '9': "Ignorado"},     # Coletou amostra
+    "DT_COLETA": {},    # Data da coleta (será convertida)
+    "TP_AMOSTRA": {'1': "Secreção de Nasoorofaringe",
+                   '2': "Lavado Broco-alveolar",
+                   '3': "Tecido post-mortem",
+                   '4': "Outra, qual?",
+                   '5': "LCR",
+                   '9': "Ignorado"},
+    "OUT_AMOST": {},    # Descrição de outro tipo de amostra
+
+    # Teste Antigênico
+    "TP_TES_AN": {'1': "Imunofluorescência (IF)", '2': "Teste rápido antigênico"},
+    "DT_RES_AN": {},    # Data do resultado do teste antigênico (será convertida)
+    "RES_AN": {'1': "Positivo", '2': "Negativo", '3': "Inconclusivo", 
+               '4': "Não realizado", '5': "Aguardando resultado", '9': "Ignorado"},
+    "POS_AN_FLU": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Positivo para Influenza
+    "TP_FLU_AN": {'1': "Influenza A", '2': "Influenza B"},    # Tipo de Influenza
+    "POS_AN_OUT": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Positivo para outros vírus
+    "DS_AN_OUT": {},    # Descrição de outro vírus no teste antigênico
+
+    # Teste molecular (RT-PCR)
+    "PCR_RESUL": {'1': "Detectável", '2': "Não Detectável", '3': "Inconclusivo", 
+                 '4': "Não realizado", '5': "Aguardando Resultado", '9': "Ignorado"},
+    "DT_PCR": {},       # Data do resultado do PCR (será convertida)
+    "POS_PCRFLU": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # PCR positivo para Influenza
+    "TP_FLU_PCR": {'1': "Influenza A", '2': "Influenza B"},   # Tipo de Influenza por PCR
+    "PCR_FLUASU": {'1': "Influenza A(H1N1)pdm09", 
+                  '2': "Influenza A (H3N2)", 
+                  '3': "Influenza A não subtipado",
+                  '4': "Influenza A não subtipável",
+                  '5': "Inconclusivo",
+                  '6': "Outro, especifique"},
+    "FLUASU_OUT": {},   # Descrição de outro subtipo de Influenza A
+
+    # Resultados virais - campos checkbox
+    "AN_SARS2": {'1': "Sim"},  # SARS-CoV-2 por teste antigênico
+    "AN_VSR": {'1': "Sim"},    # VSR por teste antigênico
+
+    # Conclusão e evolução do caso
+    "CLASSI_FIN": {'1': "SRAG por influenza", 
+                  '2': "SRAG por outro vírus respiratório", 
+                  '3': "SRAG por outro agente etiológico", 
+                  '4': "SRAG não especificado", 
+                  '5': "SRAG por covid-19"},
+    "CLASSI_OUT": {},   # Descrição de outro agente etiológico
+    "CRITERIO": {'1': "Laboratorial", 
+                '2': "Clínico Epidemiológico", 
+                '3': "Clínico", 
+                '4': "Clínico Imagem"},
+    "EVOLUCAO": {'1': "Cura", '2': "Óbito", '3': "Óbito por outras causas", '9': "Ignorado"},
+    "DT_EVOLUCA": {},   # Data da evolução (será convertida) 
+    "DT_ENCERRA": {},   # Data do encerramento (será convertida)
+    "DT_DIGITA": {},    # Data da digitação (será convertida)
+    "PAC_DSCBO": {},    # Ocupação do paciente (CBO)
+}
+
+# Mapeamento Sim/Não/Ignorado, comum à maioria dos campos: as entradas iguais a ele
+# passam a referenciar um único objeto (o literal acima é mantido por extenso porque
+# o analisar_dicionario_formatado.py lê os mapeamentos diretamente deste arquivo)
+_SNI = MappingProxyType({'1': "Sim", '2': "Não", '9': "Ignorado"})
+_CATEGORIAS = MappingProxyType({
+    campo: _SNI if mapa == _SNI else MappingProxyType(mapa)
+    for campo, mapa in _CATEGORIAS.items()
+})
+
+# Campos com mapeamento de códigos, na ordem do dicionário
+_CAMPOS_MAPEADOS = tuple(campo for campo, mapa in _CATEGORIAS.items() if mapa)
+
+def _chave_texto(valor):
+    """
+    Forma normalizada de um valor para comparação com as descrições: sem espaços nas
+    bordas, em maiúsculas e em Unicode NFC (de modo que "Não" com o til como caractere
+    combinante corresponde a "Não" pré-composto).
+    """
+    return unicodedata.normalize('NFC', str(valor).strip().upper())
+
+# Valores textuais (normalizados) de todos os mapeamentos, para detectar campos já mapeados
+_VALORES_MAPEADOS = frozenset(_chave_texto(v) for mapa in _CATEGORIAS.values() for v in mapa.values())
+
+# Campos checkbox (marcado = 1), convertidos para Sim/Não
+_CAMPOS_CHECKBOX = ('AN_SARS2', 'AN_VSR', 'AN_PARA1', 'AN_PARA2', 'AN_PARA3', 'AN_ADENO', 'AN_OUTRO',
+                    'PCR_SARS2', 'PCR_VSR', 'PCR_PARA1', 'PCR_PARA2', 'PCR_PARA3', 'PCR_PARA4',
+                    'PCR_ADENO', 'PCR_METAP', 'PCR_BOCA', 'PCR_RINO', 'PCR_OUTRO')
+
+# Colunas numéricas inteiras e o menor tipo que comporta seus valores
+_COLUNAS_INTEIRAS = {
+    'NU_IDADE_N': 'int16', 'SEM_NOT': 'int8', 'SEM_PRI': 'int8',
+    'CO_REGIONA': 'int32', 'CO_MUN_NOT': 'int32', 'CO_RG_RESI': 'int32',
+    'CO_RG_INTE': 'int32', 'CO_MU_INTE': 'int32'
+}
+
+def _tipo_inteiro_reduzido(dtype, tipo):
+    """Retorna o dtype inteiro `tipo` na mesma família (PyArrow, NumPy ou nullable) de `dtype`."""
+    if isinstance(dtype, pd.ArrowDtype):
+        import pyarrow as pa
+        return pd.ArrowDtype(getattr(pa, tipo)())
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        return tipo.capitalize()
+    return tipo
+
+def otimizar_tipos(df):
+    """
+    Reduz a memória do DataFrame antes do mapeamento de categorias.
+    
+    As colunas inteiras conhecidas são convertidas para int8/int16/int32 quando seus valores
+    cabem no tipo menor, e os campos de código (categorias e checkboxes) passam a ser
+    'category', armazenados como códigos inteiros de 1 ou 2 bytes por linha.
+    Os valores não são alterados, apenas a sua representação.
+    """
+    memoria_antes = df.memory_usage(deep=True).sum()
+    colunas = set(df.columns)
+    
+    for campo, tipo in _COLUNAS_INTEIRAS.items():
+        if campo in colunas and pd.api.types.is_integer_dtype(df[campo].dtype):
+            limites = np.iinfo(tipo)
+            minimo, maximo = df[campo].min(), df[campo].max()
+            if pd.isna(minimo) or (limites.min <= minimo and maximo <= limites.max):
+                df[campo] = df[campo].astype(_tipo_inteiro_reduzido(df[campo].dtype, tipo))
+    
+    for campo in _CAMPOS_MAPEADOS + _CAMPOS_CHECKBOX:
+        if campo in colunas and not isinstance(df[campo].dtype, pd.CategoricalDtype):
+            df[campo] = df[campo].astype('category')
+    
+    memoria_depois = df.memory_usage(deep=True).sum()
+    logger.info("Memória do DataFrame: %.1f MB -> %.1f MB", memoria_antes / 2**20, memoria_depois / 2**20)
     return df
 
+# Colunas efetivamente usadas no processamento (projeção opcional na leitura)
+_COLUNAS_UTILIZADAS = frozenset(_CATEGORIAS) | frozenset(_CAMPOS_DATA) | frozenset(_CAMPOS_CHECKBOX)
+
+# Número mínimo de linhas para distribuir as colunas entre processos (abaixo disso,
+# o custo de enviar as colunas aos processos supera o ganho)
+_LINHAS_MINIMAS_PARALELO = 200_000
+
+def _chamada_protegida(funcao, argumentos):
+    """Executa `funcao(*argumentos)` e retorna (resultado, None), ou (None, mensagem de erro)."""
+    try:
+        return funcao(*argumentos), None
+    except Exception as e:
+        return None, str(e)
+
+def _executar_por_coluna(funcao, argumentos, n_linhas):
+    """
+    Aplica `funcao` a cada tupla de `argumentos` (uma por coluna), preservando a ordem.
+    
+    Para DataFrames com pelo menos _LINHAS_MINIMAS_PARALELO linhas e mais de uma CPU,
+    as colunas são distribuídas entre processos com ProcessPoolExecutor. Erros em uma
+    coluna não interrompem as demais.
+    
+    Returns:
+        list: Uma tupla (resultado, erro) por item de `argumentos`
+    """
+    n_processos = min(os.cpu_count() or 1, len(argumentos))
+    if n_linhas < _LINHAS_MINIMAS_PARALELO or n_processos < 2:
+        return [_chamada_protegida(funcao, args) for args in argumentos]
+    
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        return list(executor.map(_chamada_protegida, [funcao] * len(argumentos), argumentos))
+
+def _descricao_codigo(valor, mapa):
+    """
+    Retorna a descrição do código `valor` em `mapa`, ou None se não houver correspondência.
+    
+    Aceita o código exato (ignorando espaços) e a forma decimal lida pelo pandas ('1.0').
+    São duas consultas diretas ao mapa, em vez de percorrer seus códigos: como nenhum
+    código do dicionário contém espaços ou '.0', no máximo uma das formas corresponde
+    a um código.
+    """
+    texto = str(valor)
+    descricao = mapa.get(texto.strip())
+    if descricao is None:
+        descricao = mapa.get(texto.replace('.0', ''))
+    return descricao
+
+def _categorica_por_tabela(tabela, codigos, serie):
+    """
+    Monta a coluna 'category' cujos valores são `tabela[codigos]` (código -1 = nulo).
+    
+    As categorias são obtidas fatorando apenas a pequena tabela de valores distintos, sem
+    percorrer novamente as linhas; cada registro ocupa apenas o seu código inteiro.
+    """
+    codigos_tabela, categorias = pd.factorize(tabela)
+    nulos = codigos < 0
+    codigos_finais = np.full(len(codigos), -1, dtype=np.int64)
+    codigos_finais[~nulos] = codigos_tabela[codigos[~nulos]]
+    valores = pd.Categorical.from_codes(codigos_finais, categories=pd.Index(categorias, dtype=object))
+    return pd.Series(valores, index=serie.index, name=serie.name)
+
+def _mapear_campo(campo, serie):
+    """
+    Substitui os códigos da coluna `serie` pelas descrições de _CATEGORIAS[campo].
+    
+    A coluna resultante é 'category' (descrições e códigos sem correspondência como
+    categorias), com um código inteiro por registro.
+    
+    Returns:
+        tuple: (coluna resultante, valores textuais já mapeados encontrados, quantidade de
+        registros mapeados, ou None se o campo já estava totalmente mapeado e foi pulado)
+    """
+    mapa = _CATEGORIAS[campo]
+    
+    # Fatorar a coluna: os valores distintos são tratados uma única vez e
+    # o resultado é expandido para todas as linhas pelos códigos inteiros
+    codigos, unicos = pd.factorize(serie)
+    unicos = unicos.tolist()
+    
+    # Obter valores únicos (não nulos) como strings normalizadas
+    valores_unicos = list(dict.fromkeys(_chave_texto(v) for v in unicos))
+    
+    # Verificar se já contém valores textuais mapeados
+    valores_texto = [v for v in valores_unicos if v in _VALORES_MAPEADOS]
+    valores_originais = [v for v in valores_unicos if v not in _VALORES_MAPEADOS]
+    
+    # Pular se já totalmente mapeado
+    if valores_texto and not valores_originais:
+        return serie.astype('category'), valores_texto, None
+    
+    # Tabela de tradução dos valores distintos; a última posição de `mapeado`
+    # corresponde às linhas nulas (código -1)
+    tabela = np.empty(len(unicos), dtype=object)
+    mapeado = np.zeros(len(unicos) + 1, dtype=bool)
+    for i, valor in enumerate(unicos):
+        descricao = _descricao_codigo(valor, mapa)
+        mapeado[i] = descricao is not None
+        tabela[i] = descricao if mapeado[i] else valor
+    
+    mapeados = int(mapeado[codigos].sum())
+    return _categorica_por_tabela(tabela, codigos, serie), valores_texto, mapeados
+
+def _mapear_checkbox(serie):
+    """
+    Converte um campo checkbox: valores 1/1.0 viram "Sim" e os demais valores não nulos, "Não".
+    
+    Como em _mapear_campo, o teste é feito uma vez por valor distinto e expandido para as
+    linhas pelos códigos inteiros. Se nenhum valor for 1, os valores são mantidos; em
+    todos os casos a coluna resultante é 'category'.
+    
+    Returns:
+        tuple: (coluna resultante, 'ja_mapeado' se já continha Sim/Não, 'mapeado' se
+        foi convertida, ou None se não havia valores marcados)
+    """
+    # Fatorar a coluna no próprio dtype (sem convertê-la antes para objetos do Python)
+    codigos, unicos = pd.factorize(serie)
+    unicos = unicos.tolist()
+    
+    # Verificar se já tem "SIM" ou "NÃO"
+    valores = {_chave_texto(v) for v in unicos}
+    if "SIM" in valores or "NÃO" in valores:
+        return serie.astype('category'), 'ja_mapeado'
+    
+    # Valores distintos que representam "1"; a última posição corresponde às linhas nulas
+    marcado = np.array([str(v).strip() in ('1', '1.0') for v in unicos] + [False])
+    if not marcado[codigos].any():
+        return serie.astype('category'), None
+    
+    tabela = np.where(marcado[:-1], "Sim", "Não").astype(object)
+    return _categorica_por_tabela(tabela, codigos, serie), 'mapeado'
+
 # Função para aplicar mapeamentos categóricos conforme o dicionário de dados
 def aplicar_categorias_completo(df):
-    # Dicionário de mapeamento atualizado conforme DICIONARIO.txt oficial (19/09/2022)
-    categorias = {
-        # Dados de Identificação e Notificação
-        "NU_NOTIFIC": {},   # Número do registro (numérico/alfanumérico – não mapeamos)
-        "DT_NOTIFIC": {},   # Data de notificação (será convertida)
-        "SEM_NOT": {},      # Semana epidemiológica calculada (interno)
-        "DT_SIN_PRI": {},   # Data dos primeiros sintomas (será convertida)
-        "SEM_PRI": {},      # Semana epidemiológica dos sintomas (interno)
-        "SG_UF_NOT": {},    # UF de notificação (tabela IBGE)
-        "ID_REGIONA": {},   # Região de saúde de notificação (tabela IBGE)
-        "CO_REGIONA": {},   # Código da região de notificação (tabela IBGE)
-        "ID_MUNICIP": {},   # Município de notificação (tabela IBGE)
-        "CO_MUN_NOT": {},   # Código do município de notificação (tabela IBGE)
-        "ID_UNIDADE": {},   # Unidade de saúde (tabela CNES)
-
-        # Dados do Paciente 
-        "TEM_CPF": {'1': "Sim", '2': "Não"},
-        "ESTRANG": {'1': "Sim", '2': "Não"},
-        "CS_SEXO": {'1': "Masculino", '2': "Feminino", '9': "Ignorado"},
-        "DT_NASC": {},      # Data de nascimento (será convertida)
-        "NU_IDADE_N": {},   # Idade informada (numérica)
-        "TP_IDADE": {'1': "Dia", '2': "Mês", '3': "Ano"},
-        # COD_IDADE não foi encontrado no dicionário
-        "CS_GESTANT": {'1': "1º Trimestre", '2': "2º Trimestre", '3': "3º Trimestre",
-                       '4': "Idade Gestacional Ignorada", '5': "Não", '6': "Não se aplica", '9': "Ignorado"},
-        "CS_RACA": {'1': "Branca", '2': "Preta", '3': "Amarela", '4': "Parda", '5': "Indígena", '9': "Ignorado"},
-        "CS_ESCOL_N": {'0': "Sem escolaridade/Analfabeto",
-                       '1': "Fundamental 1º ciclo (1ª a 5ª série)",
-                       '2': "Fundamental 2º ciclo (6ª a 9ª série)",
-                       '3': "Médio (1º ao 3º ano)",
-                       '4': "Superior",
-                       '5': "Não se aplica",
-                       '9': "Ignorado"},
-        "ID_PAIS": {},      # País de residência (tabela de países)
-        "SG_UF": {},        # UF de residência (tabela IBGE)
-        "ID_RG_RESI": {},   # Região de saúde de residência (tabela IBGE)
-        "CO_RG_RESI": {},   # Código região de residência (tabela IBGE)
-        "ID_MN_RESI": {},   # Município de residência (tabela IBGE)
-        # SURTO_SG não foi encontrado no dicionário
-
-        # Dados de Notificação Adicionais e de Contato
-        "NOSOCOMIAL": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Caso nosocomial (infecção hospitalar)
-        "AVE_SUINO": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Contato com aves ou suínos
-        "OUT_ANIM": {},     # Descrição de outro animal (se aplicável)
-
-        # Sinais e Sintomas (todos usam o mesmo mapeamento)
-        "FEBRE": {'1': "Sim", '2': "Não", '9': "Ignorado"},
-        "TOSSE": {'1': "Sim", '2': "Não", '9': "Ignorado"},
-        "GARGANTA": {'1': "Sim", '2': "Não", '9': "Ignorado"},    # Dor de garganta
-        "DISPNEIA": {'1': "Sim", '2': "Não", '9': "Ignorado"},    # Dificuldade para respirar
-        "DESC_RESP": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Desconforto respiratório
-        "SATURACAO": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Saturação O2 < 95%
-        "DIARREIA": {'1': "Sim", '2': "Não", '9': "Ignorado"},
-        "VOMITO": {'1': "Sim", '2': "Não", '9': "Ignorado"},
-        "DOR_ABD": {'1': "Sim", '2': "Não", '9': "Ignorado"},     # Dor abdominal
-        "FADIGA": {'1': "Sim", '2': "Não", '9': "Ignorado"},
-        "PERD_OLFT": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Perda do olfato
-        "PERD_PALA": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Perda do paladar
-        "OUTRO_SIN": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Outros sintomas
-        "OUTRO_DES": {},    # Descrição de outros sintomas
-
-        # Fatores de Risco (todos usam o mesmo mapeamento)
-        "FATOR_RISC": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Tem fator de risco
-        "PUERPERA": {'1': "Sim", '2': "Não", '9': "Ignorado"},    # Puérpera (até 45 dias após parto)
-        "CARDIOPATI": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Doença cardiovascular crônica
-        "HEMATOLOGI": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Doença hematológica crônica
-        "SIND_DOWN": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Síndrome de Down
-        "HEPATICA": {'1': "Sim", '2': "Não", '9': "Ignorado"},    # Doença hepática crônica
-        "ASMA": {'1': "Sim", '2': "Não", '9': "Ignorado"},
-        "DIABETES": {'1': "Sim", '2': "Não", '9': "Ignorado"},
-        "NEUROLOGIC": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Doença neurológica crônica
-        "PNEUMOPATI": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Pneumopatia crônica
-        "IMUNODEPRE": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Imunodeficiência/Imunodepressão
-        "RENAL": {'1': "Sim", '2': "Não", '9': "Ignorado"},       # Doença renal crônica
-        "OBESIDADE": {'1': "Sim", '2': "Não", '9': "Ignorado"},
-        "OBES_IMC": {},     # Valor do IMC (numérico)
-        "OUT_MORBI": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Outros fatores de risco
-        "MORB_DESC": {},    # Descrição de outros fatores de risco
-
-        # Vacinação contra Gripe e COVID-19
-        "VACINA": {'1': "Sim", '2': "Não", '9': "Ignorado"},      # Recebeu vacina contra gripe
-        "DT_UT_DOSE": {},   # Data da última dose de vacina (será convertida)
-        "VACINA_COV": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Recebeu vacina COVID-19
-        "DOSE_1_COV": {},   # Data da 1ª dose COVID-19 (será convertida)
-        "DOSE_2_COV": {},   # Data da 2ª dose COVID-19 (será convertida)
-        "DOSE_REF": {},     # Data da dose reforço COVID-19 (será convertida)
-        "FAB_COV_1": {},    # Fabricante da 1ª dose COVID-19
-        "FAB_COV_2": {},    # Fabricante da 2ª dose COVID-19
-        "FAB_COVREF": {},   # Fabricante da dose reforço COVID-19
-        "LAB_PR_COV": {},   # Lab.produtor da vacina - não há mapeamento no dicionário
-
-        # Tratamento - Antiviral
-        "ANTIVIRAL": {'1': "Sim", '2': "Não", '9': "Ignorado"},   # Usou antiviral para gripe
-        "TP_ANTIVIR": {'1': "Oseltamivir", '2': "Zanamivir", '3': "Outro"},
-
-        # Internação e UTI
-        "DT_INTERNA": {},   # Data da internação (será convertida)
-        "SG_UF_INTE": {},   # UF de internação (tabela IBGE)
-        "ID_RG_INTE": {},   # Região de saúde de internação (tabela IBGE)
-        "CO_RG_INTE": {},   # Código da região de internação (tabela IBGE)
-        "ID_MN_INTE": {},   # Município de internação (tabela IBGE)
-        "CO_MU_INTE": {},   # Código do município de internação (tabela IBGE)
-        "UTI": {'1': "Sim", '2': "Não", '9': "Ignorado"},         # Internado em UTI
-        "DT_ENTUTI": {},    # Data de entrada na UTI (será convertida)
-        "DT_SAIDUTI": {},   # Data de saída da UTI (será convertida)
-        "SUPORT_VEN": {'1': "Sim, invasivo", '2': "Sim, não invasivo", '3': "Não", '9': "Ignorado"},
-
-        # Exames radiológicos
-        "RAIOX_RES": {'1': "Normal", '2': "Infiltrado intersticial", '3': "Consolidação",
-                      '4': "Misto", '5': "Outro", '6': "Não realizado", '9': "Ignorado"},
-        "RAIOX_OUT": {},    # Descrição de outro resultado de RX
-        "DT_RAIOX": {},     # Data do RX (será convertida)
-        "TOMO_RES": {'1': "Típico COVID-19", '2': "Indeterminado COVID-19",
-                     '3': "Atípico COVID-19", '4': "Negativo para Pneumonia",
-                     '5': "Outro", '6': "Não realizado", '9': "Ignorado"},
-        "TOMO_OUT": {},     # Descrição de outro resultado de tomografia
-        "DT_TOMO": {},      # Data da tomografia (será convertida)
-
-        # Teste Diagnóstico - Amostra e Coleta
-        "AMOSTRA": {'1': "Sim", '2': "Não", '9': "Ignorado"},     # Coletou amostra
-        "DT_COLETA": {},    # Data da coleta (será convertida)
-        "TP_AMOSTRA": {'1': "Secreção de Nasoorofaringe",
-                       '2': "Lavado Broco-alveolar",
-                       '3': "Tecido post-mortem",
-                       '4': "Outra, qual?",
-                       '5': "LCR",
-                       '9': "Ignorado"},
-        "OUT_AMOST": {},    # Descrição de outro tipo de amostra
-
-        # Teste Antigênico
-        "TP_TES_AN": {'1': "Imunofluorescência (IF)", '2': "Teste rápido antigênico"},
-        "DT_RES_AN": {},    # Data do resultado do teste antigênico (será convertida)
-        "RES_AN": {'1': "Positivo", '2': "Negativo", '3': "Inconclusivo", 
-                   '4': "Não realizado", '5': "Aguardando resultado", '9': "Ignorado"},
-        "POS_AN_FLU": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Positivo para Influenza
-        "TP_FLU_AN": {'1': "Influenza A", '2': "Influenza B"},    # Tipo de Influenza
-        "POS_AN_OUT": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # Positivo para outros vírus
-        "DS_AN_OUT": {},    # Descrição de outro vírus no teste antigênico
-
-        # Teste molecular (RT-PCR)
-        "PCR_RESUL": {'1': "Detectável", '2': "Não Detectável", '3': "Inconclusivo", 
-                     '4': "Não realizado", '5': "Aguardando Resultado", '9': "Ignorado"},
-        "DT_PCR": {},       # Data do resultado do PCR (será convertida)
-        "POS_PCRFLU": {'1': "Sim", '2': "Não", '9': "Ignorado"},  # PCR positivo para Influenza
-        "TP_FLU_PCR": {'1': "Influenza A", '2': "Influenza B"},   # Tipo de Influenza por PCR
-        "PCR_FLUASU": {'1': "Influenza A(H1N1)pdm09", 
-                      '2': "Influenza A (H3N2)", 
-                      '3': "Influenza A não subtipado",
-                      '4': "Influenza A não subtipável",
-                      '5': "Inconclusivo",
-                      '6': "Outro, especifique"},
-        "FLUASU_OUT": {},   # Descrição de outro subtipo de Influenza A
-
-        # Resultados virais - campos checkbox
-        "AN_SARS2": {'1': "Sim"},  # SARS-CoV-2 por teste antigênico
-        "AN_VSR": {'1': "Sim"},    # VSR por teste antigênico
-
-        # Conclusão e evolução do caso
-        "CLASSI_FIN": {'1': "SRAG por influenza", 
-                      '2': "SRAG por outro vírus respiratório", 
-                      '3': "SRAG por outro agente etiológico", 
-                      '4': "SRAG não especificado", 
-                      '5': "SRAG por covid-19"},
-        "CLASSI_OUT": {},   # Descrição de outro agente etiológico
-        "CRITERIO": {'1': "Laboratorial", 
-                    '2': "Clínico Epidemiológico", 
-                    '3': "Clínico", 
-                    '4': "Clínico Imagem"},
-        "EVOLUCAO": {'1': "Cura", '2': "Óbito", '3': "Óbito por outras causas", '9': "Ignorado"},
-        "DT_EVOLUCA": {},   # Data da evolução (será convertida) 
-        "DT_ENCERRA": {},   # Data do encerramento (será convertida)
-        "DT_DIGITA": {},    # Data da digitação (será convertida)
-        "PAC_DSCBO": {},    # Ocupação do paciente (CBO)
-    }
-    
-    # Construir lista de valores textuais mapeados para todas as categorias 
-    todos_valores_texto = set()
-    for campo, mapa in categorias.items():
-        if mapa:  # Se há um mapeamento para este campo
-            todos_valores_texto.update([str(v).upper() for v in mapa.values()])
-    
     # Lista para fins de diagnóstico
     campos_ja_mapeados = []
     campos_mapeados_agora = []
     campos_nao_mapeados = []
+    colunas = set(df.columns)
     
-    # Processar cada campo categórico
-    for campo, mapa in categorias.items():
-        if campo in df.columns and mapa:
-            try:
-                # CORREÇÃO: Converter para tipo objeto primeiro para evitar problemas de tipo
-                df[campo] = df[campo].astype(object)
-                
-                # Obter valores únicos (não nulos) como strings normalizadas
-                valores_unicos = df[campo].dropna().astype(str).str.strip().str.upper().unique()
-                
-                # Verificar se já contém valores textuais mapeados
-                valores_texto = [v for v in valores_unicos if v in todos_valores_texto]
-                valores_originais = [v for v in valores_unicos if v not in todos_valores_texto]
-                
-                # Pular se já totalmente mapeado
-                if valores_texto and not valores_originais:
-                    campos_ja_mapeados.append(campo)
-                    print(f"Campo {campo} já contém valores mapeados: {', '.join(valores_texto[:3])}...")
-                    continue
-                
-                # Mapear códigos para descrições
-                print(f"Mapeando campo {campo}...")
-                mapeados = 0
-                
-                for codigo, descricao in mapa.items():
-                    try:
-                        # Criar máscaras para códigos exatos e decimais
-                        mascara = (
-                            df[campo].astype(str).str.strip() == str(codigo).strip()
-                        ) | (
-                            df[campo].apply(
-                                lambda x: str(x).replace('.0', '') == str(codigo).strip() 
-                                if pd.notnull(x) else False
-                            )
-                        )
-                        
-                        if mascara.any():
-                            df.loc[mascara, campo] = descricao
-                            mapeados += mascara.sum()
-                            
-                    except Exception as e:
-                        print(f"   Erro no código {codigo} ({campo}): {str(e)}")
-                
-                # Registrar resultados
-                if mapeados > 0:
-                    campos_mapeados_agora.append(f"{campo} ({mapeados})")
-                else:
-                    campos_nao_mapeados.append(campo)
-                    
-            except Exception as e:
-                print(f"ERRO processando {campo}: {str(e)}")
+    # Processar cada campo categórico (em paralelo entre as colunas, para DataFrames grandes)
+    campos = [campo for campo in _CAMPOS_MAPEADOS if campo in colunas]
+    resultados = _executar_por_coluna(_mapear_campo, [(campo, df[campo]) for campo in campos], len(df))
     
-    print("\nResumo do mapeamento de categorias:")
-    print(f"Campos já mapeados (pulados): {len(campos_ja_mapeados)}")
+    for campo, (resultado, erro) in zip(campos, resultados):
+        if erro is not None:
+            logger.error("ERRO processando %s: %s", campo, erro)
+            continue
+        
+        df[campo], valores_texto, mapeados = resultado
+        
+        # Campo pulado por já estar totalmente mapeado
+        if mapeados is None:
+            campos_ja_mapeados.append(campo)
+            logger.debug("Campo %s já contém valores mapeados: %s...", campo, ', '.join(valores_texto[:3]))
+            continue
+        
+        # Registrar resultados
+        logger.debug("Mapeando campo %s...", campo)
+        if mapeados > 0:
+            campos_mapeados_agora.append(f"{campo} ({mapeados})")
+        else:
+            campos_nao_mapeados.append(campo)
+    
+    logger.info("Resumo do mapeamento de categorias:")
+    logger.info("Campos já mapeados (pulados): %s", len(campos_ja_mapeados))
     if campos_ja_mapeados:
-        print(f"  {', '.join(campos_ja_mapeados[:10])}{'...' if len(campos_ja_mapeados) > 10 else ''}")
+        logger.info("  %s%s", ', '.join(campos_ja_mapeados[:10]), '...' if len(campos_ja_mapeados) > 10 else '')
     
-    print(f"Campos mapeados neste processamento: {len(campos_mapeados_agora)}")
+    logger.info("Campos mapeados neste processamento: %s", len(campos_mapeados_agora))
     if campos_mapeados_agora:
-        print(f"  {', '.join(campos_mapeados_agora[:10])}{'...' if len(campos_mapeados_agora) > 10 else ''}")
+        logger.info("  %s%s", ', '.join(campos_mapeados_agora[:10]), '...' if len(campos_mapeados_agora) > 10 else '')
     
-    print(f"Campos que não precisaram mapeamento: {len(campos_nao_mapeados)}")
+    logger.info("Campos que não precisaram mapeamento: %s", len(campos_nao_mapeados))
     
     # Tratamento especial para campos checkbox
-    campos_checkbox = ['AN_SARS2', 'AN_VSR', 'AN_PARA1', 'AN_PARA2', 'AN_PARA3', 'AN_ADENO', 'AN_OUTRO', 
-                       'PCR_SARS2', 'PCR_VSR', 'PCR_PARA1', 'PCR_PARA2', 'PCR_PARA3', 'PCR_PARA4', 
-                       'PCR_ADENO', 'PCR_METAP', 'PCR_BOCA', 'PCR_RINO', 'PCR_OUTRO']
-    
-    # Processar os checkboxes
     campos_checkbox_ja_mapeados = []
     campos_checkbox_mapeados = []
     
-    for campo in campos_checkbox:
-        if campo in df.columns:
-            try:
-                # Converter para objeto primeiro
-                df[campo] = df[campo].astype(object)
-                
-                # Verificar se já tem "SIM" ou "NÃO"
-                valores = set(df[campo].dropna().astype(str).str.upper().unique())
-                if "SIM" in valores or "NÃO" in valores:
-                    campos_checkbox_ja_mapeados.append(campo)
-                    print(f"Campo checkbox {campo} já contém valores mapeados")
-                    continue
-                
-                # Mapear valores 1/1.0 para "Sim" e outros para "Não"
-                print(f"Mapeando campo checkbox {campo}...")
-                
-                # Criar máscara simplificada para valores que representam "1"
-                mascara_sim = df[campo].apply(
-                    lambda x: str(x).strip() == '1' or str(x).strip() == '1.0' 
-                    if pd.notnull(x) else False
-                )
-                
-                # Aplicar mapeamento usando loc
-                if mascara_sim.any():
-                    df.loc[mascara_sim, campo] = "Sim"
-                    df.loc[~mascara_sim & df[campo].notna(), campo] = "Não"
-                    campos_checkbox_mapeados.append(campo)
-                
-            except Exception as e:
-                print(f"ERRO ao processar campo checkbox {campo}: {e}")
+    campos = [campo for campo in _CAMPOS_CHECKBOX if campo in colunas]
+    resultados = _executar_por_coluna(_mapear_checkbox, [(df[campo],) for campo in campos], len(df))
+    
+    for campo, (resultado, erro) in zip(campos, resultados):
+        if erro is not None:
+            logger.error("ERRO ao processar campo checkbox %s: %s", campo, erro)
+            continue
+        
+        df[campo], situacao = resultado
+        if situacao == 'ja_mapeado':
+            campos_checkbox_ja_mapeados.append(campo)
+            logger.debug("Campo checkbox %s já contém valores mapeados", campo)
+            continue
+        
+        logger.debug("Mapeando campo checkbox %s...", campo)
+        if situacao == 'mapeado':
+            campos_checkbox_mapeados.append(campo)
     
-    print(f"\nCampos checkbox já mapeados: {len(campos_checkbox_ja_mapeados)}")
-    print(f"Campos checkbox mapeados neste processamento: {len(campos_checkbox_mapeados)}")
+    logger.info("Campos checkbox já mapeados: %s", len(campos_checkbox_ja_mapeados))
+    logger.info("Campos checkbox mapeados neste processamento: %s", len(campos_checkbox_mapeados))
     if campos_checkbox_mapeados:
-        print(f"  {', '.join(campos_checkbox_mapeados)}")
+        logger.info("  %s", ', '.join(campos_checkbox_mapeados))
     
     return df
 
+@functools.lru_cache(maxsize=None)
+def _unidade_datas():
+    """Unidade (ns no pandas 2, us no pandas 3) das datas convertidas por pd.to_datetime."""
+    return np.datetime_data(pd.to_datetime(pd.Series(['01/01/2000']), format=_FORMATO_DATA).dtype)[0]
+
+def _converter_data_arrow(serie):
+    """
+    Converte os valores exatamente no formato DD/MM/AAAA com pyarrow.compute.strptime.
+    
+    O strptime do PyArrow aceita anos com menos de 4 dígitos e ajusta dias inexistentes
+    (31/02 vira 02/03), ao contrário do pandas; por isso apenas os textos com 2 dígitos de
+    dia e mês e 4 de ano cujo dia se mantém são aceitos. Os demais ficam NaT, para serem
+    tratados pelo pandas.
+    
+    Returns:
+        pandas.Series: datas datetime64 (na unidade do pandas), ou None se a coluna não
+        puder ser convertida para texto do PyArrow
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        texto = pa.array(serie.array, type=pa.string())
+    except (ImportError, TypeError, ValueError):
+        return None
+    
+    formato_exato = pc.fill_null(pc.match_substring_regex(texto, r'^\d{2}/\d{2}/\d{4}$'), False)
+    datas = pc.strptime(texto, format=_FORMATO_DATA, unit=_unidade_datas(), error_is_null=True)
+    dia = pc.cast(pc.if_else(formato_exato, pc.utf8_slice_codeunits(texto, 0, 2), None), pa.int64())
+    validas = pc.fill_null(pc.equal(pc.day(datas), dia), False)
+    datas = pc.if_else(validas, datas, None)
+    return pd.Series(datas.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name)
+
+def _converter_data(serie):
+    """
+    Converte a coluna para datetime, interpretando primeiro o formato fixo DD/MM/AAAA.
+    
+    O formato explícito é interpretado pelo strptime do PyArrow, quando disponível, e
+    depois pelo caminho vetorizado do pandas (strptime em C); apenas os valores que não
+    seguem esse formato passam pela interpretação genérica com dayfirst.
+    Valores inválidos viram NaT.
+    """
+    if not pd.api.types.is_string_dtype(serie.dtype):
+        return pd.to_datetime(serie, errors='coerce', dayfirst=True)
+    
+    datas = _converter_data_arrow(serie)
+    if datas is None:
+        datas = pd.to_datetime(serie, format=_FORMATO_DATA, errors='coerce', cache=True)
+    else:
+        restantes = datas.isna() & serie.notna()
+        if restantes.any():
+            datas[restantes] = pd.to_datetime(serie[restantes], format=_FORMATO_DATA, errors='coerce',
+                                              cache=True)
+    restantes = datas.isna() & serie.notna()
+    if restantes.any():
+        with warnings.catch_warnings():
+            # Aviso esperado quando o formato das datas restantes não pode ser inferido
+            warnings.simplefilter('ignore', UserWarning)
+            datas[restantes] = pd.to_datetime(serie[restantes], errors='coerce', dayfirst=True)
+    return datas
+
+def _dias_entre(inicio, fim):
+    """
+    Calcula os dias inteiros de `inicio` até `fim`, arredondados para baixo (como Timedelta.days).
+    
+    Subtrai diretamente os valores datetime64 e divide sua representação inteira pela
+    duração de um dia, sem criar o TimedeltaIndex intermediário de `.dt.days`.
+    
+    Returns:
+        tuple: (dias em int64, máscara das linhas em que alguma das datas é nula)
+    """
+    diferenca = np.subtract(fim.to_numpy(), inicio.to_numpy())
+    if diferenca.dtype.kind != 'm':
+        raise TypeError(f"campos {inicio.name}/{fim.name} não são datas")
+    unidade = np.datetime_data(diferenca.dtype)[0]
+    por_dia = np.timedelta64(1, 'D') // np.timedelta64(1, unidade)
+    return diferenca.view('i8') // por_dia, np.isnat(diferenca)
+
+# Numba (opcional): compila a diferença em dias de todos os pares de datas em um único laço
+# paralelo, em vez de uma passagem do NumPy para cada etapa (subtração, nulos e divisão)
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Representação inteira de NaT em datetime64
+_NAT = np.iinfo(np.int64).min
+
+if njit is not None:
+    @njit(parallel=True)
+    def _dias_numba(inicios, fins, por_dia):
+        n_pares, n_linhas = inicios.shape
+        dias = np.zeros((n_pares, n_linhas), dtype=np.int64)
+        nulos = np.empty((n_pares, n_linhas), dtype=np.bool_)
+        for j in prange(n_linhas):
+            for i in range(n_pares):
+                nulos[i, j] = inicios[i, j] == _NAT or fins[i, j] == _NAT
+                if not nulos[i, j]:
+                    dias[i, j] = (fins[i, j] - inicios[i, j]) // por_dia
+        return dias, nulos
+else:
+    _dias_numba = None
+
+# Campos calculados a partir da diferença entre duas datas: (campo, data inicial, data final)
+_PARES_DATAS = (
+    ('IDADE_ANOS', 'DT_NASC', 'DT_SIN_PRI'),
+    ('TEMPO_INTERNACAO', 'DT_INTERNA', 'DT_EVOLUCA'),
+    ('TEMPO_UTI', 'DT_ENTUTI', 'DT_SAIDUTI'),
+)
+
+def _dias_entre_pares(df, colunas):
+    """
+    Calcula, como _dias_entre, os dias de todos os pares de _PARES_DATAS de uma só vez.
+    
+    As datas iniciais e finais são empilhadas em duas matrizes (um par por linha), de modo
+    que a subtração, a divisão pela duração do dia e a detecção de nulos são feitas em uma
+    única passagem (em um laço compilado pelo Numba, se instalado, para DataFrames com pelo
+    menos _LINHAS_MINIMAS_PARALELO linhas). Pares ausentes ou que não sejam datetime64 ficam de fora (e são tratados
+    individualmente, com a respectiva mensagem de erro).
+    
+    Returns:
+        dict: campo calculado -> (dias em int64, máscara das linhas com alguma data nula)
+    """
+    pares = [(campo, inicio, fim) for campo, inicio, fim in _PARES_DATAS
+             if inicio in colunas and fim in colunas
+             and pd.api.types.is_datetime64_dtype(df[inicio].dtype)
+             and pd.api.types.is_datetime64_dtype(df[fim].dtype)]
+    if not pares:
+        return {}
+    
+    inicios = [df[inicio].to_numpy() for _, inicio, _ in pares]
+    fins = [df[fim].to_numpy() for _, _, fim in pares]
+    tipo = np.result_type(*inicios, *fins)
+    inicios = np.stack([datas.astype(tipo, copy=False) for datas in inicios])
+    fins = np.stack([datas.astype(tipo, copy=False) for datas in fins])
+    por_dia = np.timedelta64(1, 'D') // np.timedelta64(1, np.datetime_data(tipo)[0])
+    if _dias_numba is not None and len(df) >= _LINHAS_MINIMAS_PARALELO:
+        dias, nulos = _dias_numba(inicios.view('i8'), fins.view('i8'), por_dia)
+    else:
+        diferenca = np.subtract(fins, inicios)
+        dias = diferenca.view('i8') // por_dia
+        nulos = np.isnat(diferenca)
+    return {campo: (dias[i], nulos[i]) for i, (campo, _, _) in enumerate(pares)}
+
+def _com_nulos(dias, nulos):
+    """Retorna os dias como int64, ou float64 com NaN nas linhas nulas (como `.dt.days`)."""
+    if not nulos.any():
+        return dias
+    valores = dias.astype(np.float64)
+    valores[nulos] = np.nan
+    return valores
+
 # Função para converter campos de data e criar campos calculados
 def criar_campos_calculados(df):
-    # Lista de campos de data – acrescente ou remova conforme sua base
-    campos_data = [
-        'DT_NOTIFIC', 'DT_SIN_PRI', 'DT_NASC', 'DT_INTERNA', 'DT_ENTUTI',
-        'DT_SAIDUTI', 'DT_EVOLUCA', 'DT_ENCERRA', 'DOSE_1_COV', 'DOSE_2_COV',
-        'DOSE_REF', 'DT_RAIOX', 'DT_TOMO', 'DT_COLETA', 'DT_RES_AN',
-        'DT_PCR', 'DT_CO_SOR', 'DT_RES', 'DT_DIGITA'
-    ]
-    
-    # Primeiro, converter todos os campos de data
-    for campo in campos_data:
-        if campo in df.columns:
-            try:
-                df[campo] = pd.to_datetime(df[campo], errors='coerce', dayfirst=True)
-                print(f"Campo convertido para data: {campo}")
-            except Exception as e:
-                print(f"Erro convertendo campo {campo}: {e}")
+    colunas = set(df.columns)
+    
+    # Primeiro, converter todos os campos de data (em paralelo, para DataFrames grandes)
+    campos = _campos_data(df.columns)
+    resultados = _executar_por_coluna(_converter_data, [(df[campo],) for campo in campos], len(df))
+    for campo, (datas, erro) in zip(campos, resultados):
+        if erro is None:
+            df[campo] = datas
+            logger.debug("Campo convertido para data: %s", campo)
+        else:
+            logger.error("Erro convertendo campo %s: %s", campo, erro)
     
     # Dicionário para armazenar temporariamente os novos campos calculados
     novos_campos = {}
     
+    # Diferenças em dias de todos os pares de datas, calculadas em conjunto
+    diferencas = _dias_entre_pares(df, colunas)
+    
     # Calcular idade em anos usando DT_NASC e DT_SIN_PRI
-    if 'DT_NASC' in df.columns and 'DT_SIN_PRI' in df.columns:
+    if 'DT_NASC' in colunas and 'DT_SIN_PRI' in colunas:
         try:
-            novos_campos['IDADE_ANOS'] = (df['DT_SIN_PRI'] - df['DT_NASC']).dt.days / 365.25
-            novos_campos['IDADE_ANOS'] = novos_campos['IDADE_ANOS'].round(1)
-            print("Campo calculado: IDADE_ANOS")
+            dias, nulos = diferencas.get('IDADE_ANOS') or _dias_entre(df['DT_NASC'], df['DT_SIN_PRI'])
+            anos = np.divide(dias, 365.25)
+            anos[nulos] = np.nan
+            novos_campos['IDADE_ANOS'] = np.round(anos, 1, out=anos)
+            logger.debug("Campo calculado: IDADE_ANOS")
         except Exception as e:
-            print(f"Erro ao calcular idade: {e}")
+            logger.error("Erro ao calcular idade: %s", e)
     
     # Calcular tempo de internação (dias) usando DT_INTERNA e DT_EVOLUCA
-    if 'DT_INTERNA' in df.columns and 'DT_EVOLUCA' in df.columns:
+    if 'DT_INTERNA' in colunas and 'DT_EVOLUCA' in colunas:
         try:
-            novos_campos['TEMPO_INTERNACAO'] = (df['DT_EVOLUCA'] - df['DT_INTERNA']).dt.days
-            print("Campo calculado: TEMPO_INTERNACAO")
+            novos_campos['TEMPO_INTERNACAO'] = _com_nulos(
+                *(diferencas.get('TEMPO_INTERNACAO') or _dias_entre(df['DT_INTERNA'], df['DT_EVOLUCA'])))
+            logger.debug("Campo calculado: TEMPO_INTERNACAO")
         except Exception as e:
-            print(f"Erro ao calcular tempo de internação: {e}")
+            logger.error("Erro ao calcular tempo de internação: %s", e)
     
     # Calcular tempo de UTI usando DT_ENTUTI e DT_SAIDUTI
-    if 'DT_ENTUTI' in df.columns and 'DT_SAIDUTI' in df.columns:
+    if 'DT_ENTUTI' in colunas and 'DT_SAIDUTI' in colunas:
         try:
-            novos_campos['TEMPO_UTI'] = (df['DT_SAIDUTI'] - df['DT_ENTUTI']).dt.days
-            print("Campo calculado: TEMPO_UTI")
+            novos_campos['TEMPO_UTI'] = _com_nulos(
+                *(diferencas.get('TEMPO_UTI') or _dias_entre(df['DT_ENTUTI'], df['DT_SAIDUTI'])))
+            logger.debug("Campo calculado: TEMPO_UTI")
         except Exception as e:
-            print(f"Erro ao calcular tempo de UTI: {e}")
+            logger.error("Erro ao calcular tempo de UTI: %s", e)
     
-    # Adicionar todos os novos campos calculados ao DataFrame de uma só vez
+    # Adicionar os novos campos calculados como novas colunas, sem copiar as existentes
+    # (o pd.concat com um DataFrame temporário copiava todos os blocos do DataFrame)
     if novos_campos:
-        # Criar um DataFrame temporário com os novos campos
-        df_novos_campos = pd.DataFrame(novos_campos, index=df.index)
-        
-        # Concatenar o DataFrame original com o DataFrame dos novos campos
-        df = pd.concat([df, df_novos_campos], axis=1)
-        print(f"Adicionados {len(novos_campos)} campos calculados de uma só vez para evitar fragmentação")
+        with warnings.catch_warnings():
+            # São só três inserções: o aviso de fragmentação não se aplica
+            warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+            for campo, valores in novos_campos.items():
+                df[campo] = valores
+        logger.info("Adicionados %s campos calculados sem copiar as colunas existentes", len(novos_campos))
     
     return df
 
-# Função para exportar os dados tratados para CSV (separador ; e codificação UTF-8-SIG)
-def exportar_dados(df, nome_arquivo="dados_srag_tratados.csv"):
+def _tabela_arrow(df):
+    """
+    Converte o DataFrame para uma tabela do PyArrow, sem o índice.
+    
+    Colunas de objetos (ou categorias) com tipos misturados (descrições mapeadas junto
+    de códigos numéricos fora do dicionário) são gravadas como texto, como aparecem no CSV.
+    """
+    import pyarrow as pa
+    
+    def tipos_mistos(serie):
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            return serie.cat.categories.inferred_type.startswith('mixed')
+        return serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=True).startswith('mixed')
+    
+    colunas_mistas = [col for col in df.columns if tipos_mistos(df[col])]
+    if colunas_mistas:
+        textos = {}
+        for col in colunas_mistas:
+            serie = df[col].astype(object)
+            textos[col] = serie.where(serie.isna(), serie.astype(str))
+        df = df.assign(**textos)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def exportar_dados_parquet(df, nome_arquivo="dados_srag_tratados.parquet"):
+    """
+    Grava os dados tratados em Parquet (zstd, com codificação por dicionário).
+    
+    As colunas de baixa cardinalidade (descrições das categorias) são armazenadas como
+    dicionário de valores mais índices inteiros, o que reduz o arquivo e o tempo de escrita.
+    """
+    import pyarrow.parquet as pq
+    
+    pq.write_table(_tabela_arrow(df), nome_arquivo, compression='zstd', compression_level=3,
+                   use_dictionary=True, data_page_size=2 << 20)
+
+def _coluna_csv_arrow(serie):
+    """
+    Converte a coluna para um array do PyArrow com os valores formatados como no
+    `to_csv` do pandas.
+    
+    Inteiros e textos seguem para o escritor do PyArrow; datas sem horário viram date32
+    (AAAA-MM-DD). Os demais tipos (números reais, booleanos, datas com horário, objetos
+    de tipos variados) são convertidos para texto pelo pandas/NumPy, pois o PyArrow os
+    formata de outra maneira (por exemplo, 12 em vez de 12.0). Em colunas 'category',
+    apenas as categorias são formatadas e os valores são obtidos pelos códigos.
+    """
+    import pyarrow as pa
+    
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        categorias = _coluna_csv_arrow(pd.Series(serie.cat.categories))
+        codigos = serie.cat.codes.to_numpy()
+        return categorias.take(pa.array(codigos, mask=codigos < 0))
+    nulos = serie.isna().to_numpy()
+    
+    if pd.api.types.is_datetime64_dtype(serie.dtype):
+        valores = serie.to_numpy()
+        por_dia = np.timedelta64(1, 'D').astype(f"m8[{np.datetime_data(valores.dtype)[0]}]").view('i8')
+        if not (valores.view('i8')[~nulos] % por_dia).any():
+            return pa.array(valores, mask=nulos).cast(pa.date32(), safe=False)
+    elif pd.api.types.is_integer_dtype(serie.dtype) or pd.api.types.is_string_dtype(serie.dtype):
+        if serie.dtype != object or pd.api.types.infer_dtype(serie, skipna=True) in ('string', 'integer', 'empty'):
+            return pa.array(serie, from_pandas=True)
+    
+    if pd.api.types.is_float_dtype(serie.dtype):
+        texto = serie.to_numpy(dtype=np.float64, na_value=np.nan).astype(str)
+    else:
+        texto = serie.astype(str).to_numpy(dtype=object)
+    return pa.array(texto, type=pa.string(), mask=nulos)
+
+def _tabela_csv_arrow(df):
+    """Converte o DataFrame para uma tabela do PyArrow formatada como no `to_csv` (ver _coluna_csv_arrow)."""
+    import pyarrow as pa
+    
+    return pa.table({col: _coluna_csv_arrow(df[col]) for col in df.columns})
+
+def _exportar_csv_pyarrow(df, nome_arquivo):
+    """
+    Grava o CSV com o escritor multithread do PyArrow (separador ; e BOM UTF-8).
+    
+    Sem aspas nos valores, como o pandas faz quando nenhum valor contém o separador, aspas
+    ou quebras de linha; se algum contiver, o PyArrow recusa a gravação e a exportação
+    volta para o `to_csv` do pandas.
+    """
+    import pyarrow.csv as pacsv
+    
+    opcoes = pacsv.WriteOptions(delimiter=';', eol=os.linesep, quoting_style='none',
+                                quoting_header='none')
+    with open(nome_arquivo, 'wb') as saida:
+        # BOM UTF-8, como nos arquivos gravados pelo pandas com encoding='utf-8-sig'
+        saida.write('\ufeff'.encode('utf-8'))
+        pacsv.write_csv(_tabela_csv_arrow(df), saida, write_options=opcoes)
+
+# Função para exportar os dados tratados (CSV com separador ; e codificação UTF-8-SIG, ou Parquet)
+def exportar_dados(df, nome_arquivo="dados_srag_tratados.csv", formato=None):
+    # Sem formato explícito, usar Parquet para arquivos .parquet e CSV nos demais casos
+    if formato is None:
+        formato = 'parquet' if nome_arquivo.lower().endswith('.parquet') else 'csv'
     try:
-        df.to_csv(nome_arquivo, index=False, encoding='utf-8-sig', sep=';')
-        print(f"Dados exportados com sucesso para {nome_arquivo}")
+        if formato == 'parquet':
+            exportar_dados_parquet(df, nome_arquivo)
+        else:
+            # Escritor CSV do PyArrow, quando disponível; em caso de recusa, seguir com o pandas.
+            # Com uma única coluna, o pandas grava os nulos como "" (e não como linha vazia).
+            try:
+                import pyarrow
+            except ImportError:
+                pyarrow = None
+            gravado = False
+            if pyarrow is not None and len(df.columns) > 1:
+                try:
+                    _exportar_csv_pyarrow(df, nome_arquivo)
+                    gravado = True
+                except pyarrow.ArrowException as e:
+                    logger.debug("Escritor CSV do PyArrow recusou os dados (%s); usando DataFrame.to_csv", e)
+            if not gravado:
+                df.to_csv(nome_arquivo, index=False, encoding='utf-8-sig', sep=';')
+        logger.info("Dados exportados com sucesso para %s", nome_arquivo)
         return True
     except Exception as e:
-        print("Erro ao exportar dados:", e)
+        logger.error("Erro ao exportar dados: %s", e)
         return False
 
 # Função principal que orquestra o processamento completo
-def processar_dados_srag(caminho_arquivo, arquivo_saida="dados_srag_tratados.csv"):
-    print("Iniciando o processamento dos dados SRAG Hospitalizado...")
-    df = carregar_dados(caminho_arquivo)
+def processar_dados_srag(caminho_arquivo, arquivo_saida="dados_srag_tratados.csv", dedup_key=None,
+                         colunas=None, usar_cache=False):
+    logger.info("Iniciando o processamento dos dados SRAG Hospitalizado...")
+    df = carregar_dados(caminho_arquivo, colunas=colunas, usar_cache=usar_cache)
     if df is None:
-        print("Erro ao carregar os dados.")
+        logger.error("Erro ao carregar os dados.")
         return None
 
-    df = limpar_dados(df)
+    df = limpar_dados(df, dedup_key=dedup_key, inplace=True)
+    df = otimizar_tipos(df)
     df = standardize_column_names(df)
     df = aplicar_categorias_completo(df)
     df = criar_campos_calculados(df)
     
     sucesso = exportar_dados(df, arquivo_saida)
     if sucesso:
-        print("Processamento concluído com sucesso!")
+        logger.info("Processamento concluído com sucesso!")
         return df
     else:
-        print("Falha na exportação dos dados.")
+        logger.error("Falha na exportação dos dados.")
         return None
 
+# Tamanho dos blocos (e, portanto, dos lotes de registros) no processamento em lotes
+_TAMANHO_BLOCO_LOTES = 32 << 20
+
+def _remover_duplicatas_lote(df, vistos):
+    """
+    Remove os registros do lote já vistos neste lote ou em lotes anteriores.
+    
+    Cada registro é identificado pelo hash de 64 bits de todas as suas colunas; `vistos`
+    é o array ordenado dos hashes já mantidos (8 bytes por registro, em vez do lote inteiro).
+    
+    Returns:
+        tuple: (lote sem duplicatas, array atualizado de hashes vistos)
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    manter = ~pd.Series(hashes).duplicated().to_numpy() & ~np.isin(hashes, vistos)
+    return df[manter], np.union1d(vistos, hashes[manter])
+
+def _esquema_lotes(tabela):
+    """
+    Esquema do arquivo Parquet gravado em lotes, a partir da tabela do primeiro lote.
+    
+    Colunas sem nenhum valor no primeiro lote viram texto e os inteiros viram float64,
+    de modo que os lotes seguintes (com ou sem nulos) possam ser convertidos para ele.
+    Nas colunas 'category' (dicionários) a mesma regra vale para os valores, e os índices
+    passam a int32, para comportar lotes com mais categorias.
+    """
+    import pyarrow as pa
+    
+    def tipo_lotes(tipo):
+        if pa.types.is_null(tipo):
+            return pa.string()
+        if pa.types.is_integer(tipo):
+            return pa.float64()
+        return tipo
+    
+    campos = []
+    for campo in tabela.schema:
+        if pa.types.is_dictionary(campo.type):
+            campo = campo.with_type(pa.dictionary(pa.int32(), tipo_lotes(campo.type.value_type)))
+        else:
+            campo = campo.with_type(tipo_lotes(campo.type))
+        campos.append(campo)
+    return pa.schema(campos)
+
+def processar_dados_srag_em_lotes(caminho_arquivo, arquivo_saida="dados_srag_tratados.csv",
+                                  encoding='latin1', sep=';'):
+    """
+    Processa um CSV grande em lotes de registros, sem carregá-lo inteiro na memória.
+    
+    O arquivo é lido com pyarrow.csv.open_csv e cada lote passa pelas mesmas etapas de
+    processar_dados_srag antes de ser acrescentado à saída (CSV ou, para arquivos
+    .parquet, Parquet gravado com ParquetWriter). O pico de memória fica proporcional ao
+    tamanho do lote. Diferenças em relação ao processamento completo:
+      - todas as colunas são lidas como texto, para que o tipo seja o mesmo em todos os lotes;
+      - duplicatas são detectadas entre todos os lotes por hash dos registros;
+      - colunas totalmente nulas não são removidas;
+      - a verificação de campos já mapeados (inclusive checkbox) é feita em cada lote.
+    
+    Returns:
+        int: Total de registros gravados, ou None em caso de erro
+    """
+    logger.info("Iniciando o processamento em lotes dos dados SRAG Hospitalizado...")
+    try:
+        import pyarrow.csv as pacsv
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.error("O processamento em lotes requer o PyArrow: pip install pyarrow")
+        return None
+    
+    # Ler apenas o cabeçalho para declarar todas as colunas como texto
+    with open(caminho_arquivo, 'r', encoding=encoding, newline='') as f:
+        colunas = next(csv.reader(f, delimiter=sep), [])
+    opcoes_leitura, opcoes_parse, opcoes_conversao = _opcoes_csv_pyarrow(
+        encoding, sep, _TAMANHO_BLOCO_LOTES, colunas_texto=colunas)
+    
+    parquet = arquivo_saida.lower().endswith('.parquet')
+    vistos = np.empty(0, dtype=np.uint64)
+    total_lido = 0
+    total_gravado = 0
+    escritor = None
+    esquema = None
+    
+    try:
+        leitor = pacsv.open_csv(caminho_arquivo, read_options=opcoes_leitura,
+                                parse_options=opcoes_parse, convert_options=opcoes_conversao)
+        with open(arquivo_saida, 'wb' if parquet else 'w',
+                  **({} if parquet else {'encoding': 'utf-8-sig', 'newline': ''})) as saida:
+            for n_lote, lote in enumerate(leitor, start=1):
+                df = lote.to_pandas(types_mapper=pd.ArrowDtype)
+                total_lido += len(df)
+                logger.info("Lote %s: %s registros", n_lote, len(df))
+                
+                df, vistos = _remover_duplicatas_lote(df, vistos)
+                df = padronizar_textos(df)
+                df = standardize_column_names(df)
+                df = aplicar_categorias_completo(df)
+                df = criar_campos_calculados(df)
+                
+                if parquet:
+                    tabela = _tabela_arrow(df)
+                    if escritor is None:
+                        esquema = _esquema_lotes(tabela)
+                        escritor = pq.ParquetWriter(saida, esquema, compression='zstd')
+                    escritor.write_table(tabela.cast(esquema))
+                else:
+                    # Inteiros como float64, como no esquema do Parquet: os campos calculados
+                    # (TEMPO_UTI, TEMPO_INTERNACAO) são int64 nos lotes sem datas nulas e
+                    # float64 nos demais, e o texto gravado não pode depender do lote
+                    inteiros = [col for col, tipo in df.dtypes.items() if pd.api.types.is_integer_dtype(tipo)]
+                    if inteiros:
+                        df = df.astype(dict.fromkeys(inteiros, np.float64))
+                    df.to_csv(saida, header=n_lote == 1, index=False, sep=';')
+                total_gravado += len(df)
+            
+            if escritor is not None:
+                escritor.close()
+    except Exception as e:
+        logger.error("Erro durante o processamento em lotes: %s", e)
+        return None
+    
+    logger.info("Duplicatas removidas: %s", total_lido - total_gravado)
+    logger.info("Dados exportados com sucesso para %s", arquivo_saida)
+    logger.info("Processamento concluído com sucesso! Total de registros gravados: %s", total_gravado)
+    return total_gravado
+
 # Bloco principal de execução
 if __name__ == "__main__":
     import argparse
@@ -551,9 +1355,23 @@ if __name__ == "__main__":
                         help='Caminho para o arquivo a ser processado (DBF, CSV ou Excel)')
     parser.add_argument('--saida', '-s', type=str,
                         default=r'C:\Users\argus\workspace\ProjetoSRAG\dados_srag_tratados.csv',
-                        help='Caminho para o arquivo de saída (CSV)')
+                        help='Caminho para o arquivo de saída (CSV, ou Parquet se terminar em .parquet)')
+    parser.add_argument('--chave', '-k', nargs='+', metavar='COLUNA',
+                        help='Colunas que identificam um registro na remoção de duplicatas '
+                             '(ex.: NU_NOTIFIC DT_NOTIFIC); por padrão, todas as colunas')
+    parser.add_argument('--colunas-dicionario', '-c', action='store_true',
+                        help='Carrega apenas as colunas usadas no processamento (categorias, datas e checkboxes)')
+    parser.add_argument('--cache', action='store_true',
+                        help='Guarda uma cópia em Parquet do arquivo carregado ao lado dele e a '
+                             'reaproveita nas execuções seguintes, enquanto o arquivo não mudar (requer PyArrow)')
+    parser.add_argument('--lotes', '-l', action='store_true',
+                        help='Processa o CSV em lotes, com uso de memória limitado (requer PyArrow)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Exibe também as mensagens de cada coluna processada')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(message)s')
     
     # Verificar se o arquivo existe
     if not os.path.exists(args.arquivo):
@@ -567,8 +1385,14 @@ if __name__ == "__main__":
     print(f"Usando arquivo de entrada: {args.arquivo}")
     print(f"Arquivo de saída será: {args.saida}")
     
+    # Processamento em lotes: os dados não ficam em memória para o resumo abaixo
+    if args.lotes:
+        exit(0 if processar_dados_srag_em_lotes(args.arquivo, args.saida) is not None else 1)
+    
     # Processamento do arquivo
-    df_processado = processar_dados_srag(args.arquivo, args.saida)
+    df_processado = processar_dados_srag(args.arquivo, args.saida, dedup_key=args.chave,
+                                         colunas=_COLUNAS_UTILIZADAS if args.colunas_dicionario else None,
+                                         usar_cache=args.cache)
     
     if df_processado is not None:
         print("\nVisualizando as primeiras linhas dos dados processados:")
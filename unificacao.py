@@ -1,6 +1,31 @@
 import pandas as pd
+import argparse
+import codecs
+import csv
+import logging
 import os
 import sys
+import threading
+
+# Mensagens de progresso da unificação (configuradas após a leitura dos argumentos; os
+# detalhes de cada tentativa de leitura usam o nível DEBUG)
+logger = logging.getLogger(__name__)
+
+# Copy-on-Write (padrão a partir do pandas 3.0): seleções de colunas, como a de
+# filtrar_colunas_existentes, não copiam os dados até que sejam modificados
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# PyArrow (opcional): leitor CSV multithread, usado pelo pandas com engine='pyarrow'
+try:
+    import pyarrow  # noqa: F401
+    pyarrow_disponivel = True
+except ImportError:
+    pyarrow_disponivel = False
+
+# Última configuração de leitura bem-sucedida (sem memory_map): os arquivos do SRAG
+# compartilham codificação e separador, então ela é tentada primeiro nos seguintes
+_ultima_config = None
 
 # Caminhos dos arquivos CSV
 arquivos_csv = [
@@ -33,33 +58,124 @@ colunas_para_manter = [
     'FAB_COV_1', 'FAB_COV_2', 'FAB_COVREF', 'LAB_PR_COV'
 ]
 
+# Colunas de texto com poucos valores distintos (UFs, nomes de municípios, regionais e
+# unidades, fabricantes de vacinas), lidas como 'category': cada valor distinto é
+# guardado uma única vez e cada registro ocupa apenas um código inteiro
+colunas_categoricas = [
+    'SG_UF_NOT', 'ID_REGIONA', 'ID_MUNICIP', 'ID_UNIDADE', 'CS_SEXO', 'ID_PAIS',
+    'SG_UF', 'ID_RG_RESI', 'ID_MN_RESI', 'SG_UF_INTE', 'ID_RG_INTE', 'ID_MN_INTE',
+    'FAB_COV_1', 'FAB_COV_2', 'FAB_COVREF', 'LAB_PR_COV'
+]
+
+# Tipos na leitura: as colunas acima e as datas (DT_*/DOSE_*), mantidas como o texto
+# DD/MM/AAAA do arquivo (o processar_srag.py as converte), também como 'category'.
+# Os valores gravados no arquivo unificado não mudam; os códigos numéricos continuam
+# com o tipo inferido pelo pandas
+tipos_colunas = {
+    col: 'category' for col in colunas_para_manter
+    if col in colunas_categoricas or col.startswith(('DT_', 'DOSE_'))
+}
+
 # Função para filtrar colunas que existem no DataFrame
 def filtrar_colunas_existentes(df, colunas_desejadas):
     """
     Filtra o DataFrame para manter apenas as colunas desejadas que existem nele.
     """
     # Identificar quais colunas desejadas realmente existem no DataFrame
-    colunas_existentes = [col for col in colunas_desejadas if col in df.columns]
+    colunas_df = set(df.columns)
+    colunas_existentes = [col for col in colunas_desejadas if col in colunas_df]
     
     # Colunas desejadas que não existem no DataFrame
-    colunas_ausentes = [col for col in colunas_desejadas if col not in df.columns]
+    colunas_ausentes = [col for col in colunas_desejadas if col not in colunas_df]
     if colunas_ausentes:
-        print(f"  Aviso: {len(colunas_ausentes)} colunas solicitadas não existem neste DataFrame:")
-        print(f"  {', '.join(colunas_ausentes[:10])}{'...' if len(colunas_ausentes) > 10 else ''}")
+        logger.warning("  Aviso: %s colunas solicitadas não existem neste DataFrame:", len(colunas_ausentes))
+        logger.warning("  %s%s", ', '.join(colunas_ausentes[:10]), '...' if len(colunas_ausentes) > 10 else '')
     
-    # Retornar DataFrame apenas com as colunas existentes
+    # Retornar DataFrame apenas com as colunas existentes (com Copy-on-Write, sem copiar
+    # os dados; se as colunas já estiverem nessa ordem, o próprio DataFrame)
+    if list(df.columns) == colunas_existentes:
+        return df
     return df[colunas_existentes]
 
+# Função para detectar a codificação e o separador de um arquivo CSV
+def detectar_formato(arquivo, tamanho_amostra=65536):
+    """
+    Detecta a codificação e o separador a partir de uma amostra do início do arquivo.
+    
+    A codificação é UTF-8 se a amostra tiver caracteres não ASCII e for UTF-8 válido, e
+    latin1 nos demais casos. O separador (';' ou ',') é obtido pelo csv.Sniffer a partir
+    do cabeçalho; se não for possível decidir, usa-se ';'.
+    
+    Returns:
+        tuple: (codificação, separador)
+    """
+    with open(arquivo, 'rb') as f:
+        amostra = f.read(tamanho_amostra)
+    
+    encoding = 'latin1'
+    if not amostra.isascii():
+        try:
+            # Decodificação incremental: um caractere cortado no fim da amostra não é erro
+            codecs.getincrementaldecoder('utf-8')().decode(amostra, final=False)
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            pass
+    
+    cabecalho = amostra.decode(encoding, errors='replace').splitlines()[:1]
+    try:
+        sep = csv.Sniffer().sniff(cabecalho[0], delimiters=';,').delimiter
+    except (csv.Error, IndexError):
+        sep = ';'
+    return encoding, sep
+
+# Função para antecipar a leitura do próximo arquivo enquanto o atual é processado
+def antecipar_leitura(arquivo, tamanho_bloco=8 << 20):
+    """
+    Pede ao sistema que leia `arquivo` para o cache de páginas em segundo plano, de modo
+    que o disco trabalhe enquanto o arquivo atual é convertido pelo leitor de CSV.
+    
+    No Linux/Unix usa os.posix_fadvise(POSIX_FADV_WILLNEED), uma simples indicação ao
+    kernel; nos demais sistemas (Windows), uma thread lê o arquivo em blocos e descarta
+    o conteúdo. Arquivos inexistentes são ignorados.
+    """
+    if not os.path.exists(arquivo):
+        return
+    if hasattr(os, 'posix_fadvise'):
+        fd = os.open(arquivo, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+        return
+    
+    def ler_em_blocos():
+        try:
+            with open(arquivo, 'rb', buffering=0) as f:
+                while f.read(tamanho_bloco):
+                    pass
+        except OSError:
+            pass
+    
+    threading.Thread(target=ler_em_blocos, daemon=True).start()
+
 # Função melhorada para carregar arquivos CSV com tratamento robusto de erros
-def carregar_csv_robusto(arquivo, tentativas=4):
+def carregar_csv_robusto(arquivo, tentativas=None):
     """
     Carrega um arquivo CSV tentando diferentes configurações caso ocorra erro.
+    
+    Se o PyArrow estiver instalado, a primeira tentativa usa o seu leitor multithread
+    (engine='pyarrow'); as demais usam os leitores do pandas. `tentativas` limita o
+    número de configurações tentadas (por padrão, todas).
     """
+    global _ultima_config
+    
     if not os.path.exists(arquivo):
-        print(f"ERRO: Arquivo não encontrado: {arquivo}")
+        logger.error("ERRO: Arquivo não encontrado: %s", arquivo)
         return None
     
-    print(f"Tentando carregar o arquivo: {arquivo}")
+    logger.info("Tentando carregar o arquivo: %s", arquivo)
     
     # Lista de configurações a tentar, em ordem de preferência
     configs = [
@@ -73,84 +189,312 @@ def carregar_csv_robusto(arquivo, tentativas=4):
         {'encoding': 'latin1', 'sep': None, 'engine': 'python', 'low_memory': False}
     ]
     
+    # Codificação e separador detectados em uma amostra do arquivo: as configurações
+    # correspondentes são tentadas primeiro, e as demais ficam como alternativas
+    encoding, sep = detectar_formato(arquivo)
+    configs.sort(key=lambda config: (config['encoding'], config['sep']) != (encoding, sep))
+    
+    # Arquivos sem compressão: os leitores do pandas mapeiam o arquivo na memória
+    # (memory_map), em vez de copiar o seu conteúdo para um buffer intermediário
+    if arquivo.lower().endswith('.csv'):
+        for config in configs:
+            config['memory_map'] = True
+    
+    # Tentativa adicional, antes das demais: leitor multithread do PyArrow com o formato detectado
+    if pyarrow_disponivel:
+        configs.insert(0, {'encoding': encoding, 'sep': sep, 'engine': 'pyarrow'})
+    
+    # A configuração que funcionou no arquivo anterior, se estiver entre as candidatas, vem primeiro
+    def sem_memory_map(config):
+        return {chave: valor for chave, valor in config.items() if chave != 'memory_map'}
+    
+    if _ultima_config is not None:
+        configs.sort(key=lambda config: sem_memory_map(config) != _ultima_config)
+    
     # Limitar às primeiras 'tentativas' configurações
     configs = configs[:tentativas]
+    tentativas = len(configs)
+    
+    # Apenas as colunas solicitadas são lidas (usecols): as demais não chegam a ser
+    # convertidas nem alocadas. Uma função, e não uma lista, para aceitar arquivos em
+    # que alguma das colunas não existe; ela também registra o cabeçalho completo
+    colunas_manter = set(colunas_para_manter)
     
     # Tentar cada configuração
     for i, config in enumerate(configs, 1):
         try:
-            print(f"  Tentativa {i}: {config}")
-            df = pd.read_csv(arquivo, **config)
-            print(f"  ✓ Sucesso! Registros: {len(df)}, Colunas: {len(df.columns)}")
+            logger.debug("  Tentativa %s: %s", i, config)
+            cabecalho = {}
             
-            # Filtrar colunas antes de retornar
-            print(f"  Filtrando colunas para manter apenas as solicitadas...")
+            def selecionar_coluna(coluna):
+                cabecalho[coluna] = None
+                return coluna in colunas_manter
+            
+            if config.get('engine') == 'pyarrow':
+                # O leitor do PyArrow só aceita uma lista em usecols: ler antes apenas o
+                # cabeçalho (nrows=0, com a função acima) e passar as colunas encontradas.
+                # Os tipos são aplicados depois da leitura (com dtype, o pandas também
+                # converte as demais colunas e falha nas numéricas com valores nulos)
+                pd.read_csv(arquivo, nrows=0, usecols=selecionar_coluna,
+                            encoding=config['encoding'], sep=config['sep'])
+                usecols = [col for col in cabecalho if col in colunas_manter]
+                df = pd.read_csv(arquivo, usecols=usecols, **config)
+                df = df.astype({col: tipo for col, tipo in tipos_colunas.items() if col in df.columns})
+            else:
+                df = pd.read_csv(arquivo, usecols=selecionar_coluna, dtype=tipos_colunas, **config)
+            logger.info("  ✓ Sucesso! Registros: %s, Colunas: %s", len(df), len(cabecalho))
+            _ultima_config = sem_memory_map(config)
+            
+            # Ordenar as colunas lidas conforme a especificação e avisar sobre as ausentes
+            logger.debug("  Filtrando colunas para manter apenas as solicitadas...")
             df_filtrado = filtrar_colunas_existentes(df, colunas_para_manter)
-            print(f"  ✓ Dataset reduzido de {len(df.columns)} para {len(df_filtrado.columns)} colunas")
+            logger.info("  ✓ Dataset reduzido de %s para %s colunas", len(cabecalho), len(df_filtrado.columns))
             
             return df_filtrado
         except Exception as e:
-            print(f"  ✗ Falha: {str(e)[:150]}...")  # Limitar tamanho da mensagem de erro
+            logger.warning("  ✗ Falha na tentativa %s: %s...", i, str(e)[:150])  # Limitar tamanho da mensagem de erro
     
     # Se chegou aqui, nenhuma configuração funcionou
-    print(f"ERRO: Não foi possível carregar o arquivo {arquivo} após {tentativas} tentativas.")
+    logger.error("ERRO: Não foi possível carregar o arquivo %s após %s tentativas.", arquivo, tentativas)
     
     # Tentar ver o conteúdo do arquivo para diagnóstico
     try:
         with open(arquivo, 'r', encoding='latin1') as f:
             primeiras_linhas = [next(f) for _ in range(5)]
-        print("Primeiras 5 linhas do arquivo para diagnóstico:")
+        logger.info("Primeiras 5 linhas do arquivo para diagnóstico:")
         for i, linha in enumerate(primeiras_linhas):
-            print(f"  Linha {i+1}: {linha[:100].strip()}...")
+            logger.info("  Linha %s: %s...", i + 1, linha[:100].strip())
     except Exception as e:
-        print(f"Não foi possível ler o conteúdo do arquivo para diagnóstico: {e}")
+        logger.error("Não foi possível ler o conteúdo do arquivo para diagnóstico: %s", e)
     
     return None
 
-# Lista para armazenar os DataFrames carregados
-dataframes = []
+# Função para alinhar as categorias das colunas 'category' antes da concatenação
+def alinhar_categorias(dataframes):
+    """
+    Dá às colunas 'category' de mesmo nome o mesmo conjunto de categorias (a união das
+    categorias de todos os DataFrames), para que o pd.concat as mantenha como 'category';
+    com categorias diferentes, a coluna unificada seria convertida para objetos.
+    
+    Só as categorias são unidas (pd.Index.union), sem concatenar os valores. Colunas que
+    não são 'category' em algum arquivo, ou cujas categorias têm tipos diferentes (por
+    exemplo, números em um arquivo e textos em outro), são mantidas como estão.
+    """
+    colunas = dict.fromkeys(col for df in dataframes for col, tipo in df.dtypes.items()
+                            if isinstance(tipo, pd.CategoricalDtype))
+    for col in colunas:
+        series = [df[col] for df in dataframes if col in df.columns]
+        if not all(isinstance(serie.dtype, pd.CategoricalDtype) for serie in series):
+            continue
+        if len({serie.cat.categories.dtype for serie in series}) > 1:
+            continue
+        categorias = series[0].cat.categories
+        for serie in series[1:]:
+            categorias = categorias.union(serie.cat.categories, sort=False)
+        for df in dataframes:
+            if col in df.columns and not df[col].cat.categories.equals(categorias):
+                df[col] = df[col].cat.set_categories(categorias)
+
+# Função para gravar o DataFrame unificado (CSV com separador ; e UTF-8-SIG, ou Parquet)
+def salvar_unificado(df, caminho_saida):
+    """
+    Grava o DataFrame unificado em `caminho_saida`: em Parquet (zstd, colunar e com
+    codificação por dicionário, sem converter os valores para texto) se o caminho
+    terminar em .parquet, ou em CSV nos demais casos.
+    """
+    if caminho_saida.lower().endswith('.parquet'):
+        # Colunas de objetos com tipos misturados (códigos numéricos junto de textos)
+        # são gravadas como texto, como aparecem no CSV
+        colunas_mistas = [col for col in df.columns if df[col].dtype == object
+                          and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed')]
+        if colunas_mistas:
+            df = df.assign(**{col: df[col].where(df[col].isna(), df[col].astype(str)) for col in colunas_mistas})
+        df.to_parquet(caminho_saida, engine='pyarrow', compression='zstd', index=False,
+                      row_group_size=200_000)
+    else:
+        df.to_csv(caminho_saida, index=False, encoding='utf-8-sig', sep=';')
 
-# Carregar cada arquivo CSV e armazenar na lista
-for arquivo in arquivos_csv:
+# Função para unificar os arquivos diretamente em Parquet com o PyArrow
+def unificar_com_pyarrow(arquivos, caminho_saida, tamanho_bloco=8 << 20):
+    """
+    Unifica os arquivos CSV em um Parquet com o PyArrow, sem montar DataFrames do pandas.
+    
+    Cada arquivo é lido em lotes (pyarrow.csv.open_csv), no formato detectado por
+    detectar_formato e apenas com as colunas solicitadas, todas como texto (as de
+    tipos_colunas codificadas por dicionário), de modo que os valores são gravados como
+    aparecem nos arquivos. Os lotes são gravados um a um pelo ParquetWriter, com as
+    colunas ausentes em um arquivo preenchidas com nulos: o uso de memória fica limitado
+    a um lote, independentemente do tamanho dos arquivos.
+    
+    Returns:
+        int: Total de registros gravados
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.parquet as pq
+    
+    # Formato e colunas solicitadas de cada arquivo; as colunas do arquivo unificado
+    # seguem a mesma ordem do pd.concat (ordem da especificação, arquivo a arquivo)
+    formatos = {}
+    colunas = {}
+    for arquivo in arquivos:
+        encoding, sep = detectar_formato(arquivo)
+        with open(arquivo, 'r', encoding='utf-8-sig' if encoding == 'utf-8' else encoding, newline='') as f:
+            cabecalho = set(next(csv.reader(f, delimiter=sep), []))
+        formatos[arquivo] = (encoding, sep, [col for col in colunas_para_manter if col in cabecalho])
+        colunas.update(dict.fromkeys(formatos[arquivo][2]))
+    
+    tipo_dicionario = pa.dictionary(pa.int32(), pa.string())
+    esquema = pa.schema([(col, tipo_dicionario if col in tipos_colunas else pa.string()) for col in colunas])
+    
+    total = 0
+    with pq.ParquetWriter(caminho_saida, esquema, compression='zstd') as escritor:
+        # Enquanto um arquivo é convertido, o próximo já é trazido do disco
+        leitura = list(formatos)
+        for n, (arquivo, (encoding, sep, presentes)) in enumerate(formatos.items()):
+            if n + 1 < len(leitura):
+                antecipar_leitura(leitura[n + 1])
+            logger.info("Lendo com o PyArrow: %s (%s colunas)", arquivo, len(presentes))
+            leitor = pv.open_csv(
+                arquivo,
+                read_options=pv.ReadOptions(encoding=encoding, block_size=tamanho_bloco),
+                parse_options=pv.ParseOptions(delimiter=sep),
+                convert_options=pv.ConvertOptions(
+                    include_columns=presentes,
+                    column_types={col: esquema.field(col).type for col in presentes},
+                    strings_can_be_null=True
+                )
+            )
+            registros = 0
+            for lote in leitor:
+                valores = [lote.column(col) if col in lote.schema.names
+                           else pa.nulls(lote.num_rows, esquema.field(col).type) for col in esquema.names]
+                escritor.write_batch(pa.RecordBatch.from_arrays(valores, schema=esquema))
+                registros += lote.num_rows
+            logger.info("  ✓ Registros: %s", registros)
+            total += registros
+    return total
+
+# Função para carregar um arquivo reaproveitando a cópia em Parquet de uma execução anterior
+def carregar_com_cache(arquivo, pasta_cache):
+    """
+    Carrega `arquivo` com carregar_csv_robusto e grava o resultado em Parquet (zstd) na
+    pasta `pasta_cache`. Se a cópia já existir e for mais recente que o CSV, ela é lida
+    no lugar do CSV: uma execução interrompida retoma a partir dos arquivos já carregados.
+    
+    A cópia é gravada com outro nome e renomeada ao final, para que uma gravação
+    interrompida não deixe um Parquet incompleto no lugar da cópia.
+    """
+    nome = os.path.splitext(os.path.basename(arquivo))[0]
+    caminho_cache = os.path.join(pasta_cache, f"{nome}.parquet")
+    if (os.path.exists(arquivo) and os.path.exists(caminho_cache)
+            and os.path.getmtime(caminho_cache) >= os.path.getmtime(arquivo)):
+        try:
+            df = pd.read_parquet(caminho_cache)
+            logger.info("Usando a cópia em Parquet de uma execução anterior: %s", caminho_cache)
+            return df
+        except Exception as e:
+            logger.warning("⚠ Cópia em Parquet inválida (%s); lendo o CSV", str(e)[:150])
+    
     df = carregar_csv_robusto(arquivo)
     if df is not None:
-        print(f"✓ Arquivo carregado com sucesso: {arquivo}")
-        # Informações básicas sobre o DataFrame
-        print(f"  - Dimensões: {df.shape[0]} linhas × {df.shape[1]} colunas")
-        # Mostrar alguns nomes de colunas como validação
-        print(f"  - Amostra de colunas: {', '.join(list(df.columns)[:5])}...")
-        dataframes.append(df)
+        try:
+            os.makedirs(pasta_cache, exist_ok=True)
+            caminho_parcial = os.path.join(pasta_cache, f"{nome}.parcial.parquet")
+            salvar_unificado(df, caminho_parcial)
+            os.replace(caminho_parcial, caminho_cache)
+            logger.debug("  Cópia em Parquet salva em: %s", caminho_cache)
+        except Exception as e:
+            logger.warning("⚠ Não foi possível salvar a cópia em Parquet: %s", e)
+    return df
+
+# Função principal que unifica os arquivos de arquivos_csv
+def main():
+    parser = argparse.ArgumentParser(description='Unifica os arquivos CSV do SRAG em um único arquivo.')
+    parser.add_argument('--saida', '-s', type=str,
+                        default=r'C:\Users\argus\workspace\ProjetoSRAG\SRAG_Unificado.csv',
+                        help='Caminho para o arquivo unificado (CSV, ou Parquet se terminar em .parquet)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Exibe também os detalhes de cada tentativa de leitura e das colunas')
+    parser.add_argument('--cache', '-c', type=str, default=None,
+                        help='Pasta para as cópias em Parquet de cada arquivo carregado, '
+                             'reaproveitadas nas execuções seguintes (requer PyArrow)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(message)s')
+    if args.cache and not pyarrow_disponivel:
+        logger.warning("⚠ PyArrow não disponível: as cópias em Parquet (--cache) não serão usadas")
+        args.cache = None
+
+    # Saída em Parquet com o PyArrow disponível: unificar os arquivos diretamente, em lotes;
+    # em caso de falha, seguir com o carregamento pelo pandas
+    arquivos_existentes = [arquivo for arquivo in arquivos_csv if os.path.exists(arquivo)]
+    if pyarrow_disponivel and args.saida.lower().endswith('.parquet') and arquivos_existentes:
+        try:
+            total = unificar_com_pyarrow(arquivos_existentes, args.saida)
+            logger.info("Arquivos unificados com sucesso! Total de registros: %s", total)
+            logger.info("Arquivo unificado salvo em: %s", args.saida)
+            return 0
+        except (pyarrow.ArrowException, UnicodeDecodeError) as e:
+            logger.warning("⚠ Falha na unificação com o PyArrow (%s); usando o pandas", str(e)[:150])
+
+    # Lista para armazenar os DataFrames carregados
+    dataframes = []
+
+    # Carregar cada arquivo CSV e armazenar na lista
+    for n, arquivo in enumerate(arquivos_csv):
+        # Enquanto este arquivo é lido, o próximo já é trazido do disco
+        if n + 1 < len(arquivos_csv):
+            antecipar_leitura(arquivos_csv[n + 1])
+        df = carregar_com_cache(arquivo, args.cache) if args.cache else carregar_csv_robusto(arquivo)
+        if df is not None:
+            logger.info("✓ Arquivo carregado com sucesso: %s", arquivo)
+            # Informações básicas sobre o DataFrame
+            logger.info("  - Dimensões: %s linhas × %s colunas", df.shape[0], df.shape[1])
+            # Mostrar alguns nomes de colunas como validação
+            logger.debug("  - Amostra de colunas: %s...", ', '.join(list(df.columns)[:5]))
+            dataframes.append(df)
+        else:
+            logger.warning("⚠ Não foi possível carregar o arquivo: %s", arquivo)
+
+    # Verificar se algum DataFrame foi carregado
+    if len(dataframes) == 0:
+        logger.error("ERRO: Nenhum arquivo válido foi carregado. Verifique os caminhos e formatos.")
+        return 1
     else:
-        print(f"⚠ Não foi possível carregar o arquivo: {arquivo}")
+        logger.info("Unificando %s arquivos...", len(dataframes))
+        
+        try:
+            # Verificar colunas de cada dataframe para identificar possíveis diferenças
+            for i, df in enumerate(dataframes):
+                logger.debug("DataFrame %s: %s colunas", i + 1, len(df.columns))
+            
+            # Verificar colunas comuns (útil para diagnóstico)
+            if len(dataframes) > 1:  # Fixed: Added missing parentheses
+                colunas_comuns = set(dataframes[0].columns).intersection(*(df.columns for df in dataframes[1:]))
+                logger.info("Total de colunas comuns a todos os arquivos: %s", len(colunas_comuns))
+                logger.debug("Colunas comuns: %s...", ', '.join(sorted(colunas_comuns)[:10]))
+            
+            # Concatenar todos os DataFrames em um único DataFrame (com as categorias alinhadas,
+            # as colunas 'category' continuam armazenadas como códigos inteiros)
+            alinhar_categorias(dataframes)
+            df_unificado = pd.concat(dataframes, ignore_index=True)
+            
+            # Liberar os DataFrames de cada arquivo (a lista e a última referência do laço),
+            # já copiados para o unificado, antes da gravação
+            dataframes.clear()
+            del df
+            logger.info("Arquivos unificados com sucesso! Total de registros: %s", len(df_unificado))
 
-# Verificar se algum DataFrame foi carregado
-if len(dataframes) == 0:
-    print("ERRO: Nenhum arquivo válido foi carregado. Verifique os caminhos e formatos.")
-    sys.exit(1)
-else:
-    print(f"\nUnificando {len(dataframes)} arquivos...")
+            # Salvar o DataFrame unificado em um novo arquivo (CSV por padrão, lido pelo processar_srag.py)
+            caminho_saida = args.saida
+            salvar_unificado(df_unificado, caminho_saida)
+            logger.info("Arquivo unificado salvo em: %s", caminho_saida)
+        except Exception as e:
+            logger.error("ERRO durante a unificação: %s", e)
+            return 1
     
-    try:
-        # Verificar colunas de cada dataframe para identificar possíveis diferenças
-        for i, df in enumerate(dataframes):
-            print(f"DataFrame {i+1}: {len(df.columns)} colunas")
-        
-        # Verificar colunas comuns (útil para diagnóstico)
-        if len(dataframes) > 1:  # Fixed: Added missing parentheses
-            colunas_comuns = set(dataframes[0].columns)
-            for df in dataframes[1:]:
-                colunas_comuns = colunas_comuns.intersection(set(df.columns))
-            print(f"Total de colunas comuns a todos os arquivos: {len(colunas_comuns)}")
-            print(f"Colunas comuns: {', '.join(sorted(list(colunas_comuns))[:10])}...")
-        
-        # Concatenar todos os DataFrames em um único DataFrame
-        df_unificado = pd.concat(dataframes, ignore_index=True)
-        print(f"Arquivos unificados com sucesso! Total de registros: {len(df_unificado)}")
-
-        # Salvar o DataFrame unificado em um novo arquivo CSV
-        caminho_saida = r'C:\Users\argus\workspace\ProjetoSRAG\SRAG_Unificado.csv'
-        df_unificado.to_csv(caminho_saida, index=False, encoding='utf-8-sig', sep=';')
-        print(f"Arquivo unificado salvo em: {caminho_saida}")
-    except Exception as e:
-        print(f"ERRO durante a unificação: {e}")
-        sys.exit(1)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())